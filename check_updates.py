@@ -19,11 +19,12 @@ Ver: 0.12.1 (sp v6.5, telegram v2.7)
 
 import asyncio
 from datetime import UTC, datetime
+from functools import lru_cache
 from os import getenv
 from pathlib import Path
 
 from aiogram import Bot
-from aiogram.exceptions import TelegramForbiddenError
+from aiogram.exceptions import TelegramForbiddenError, TelegramRetryAfter
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from dotenv import load_dotenv
 from loguru import logger
@@ -32,11 +33,14 @@ from sp.db import User
 from sp.view.messages import MessagesView
 
 _TIMETAG_PATH = Path("sp_data/last_update")
+# Сколько сообщений отправлять одновременно
+_MAX_CONCURRENT_SENDS = 25
 CHAT_MIGRATE_MESSAGE = (
     "⚠️ У вашего чата сменился ID.\nНастройки чата были перемещены."
 )
 
 
+@lru_cache(maxsize=256)
 def _week_markup(cl: str) -> InlineKeyboardMarkup:
     """Получает клавиатуру для расписание на неделю.
 
@@ -57,6 +61,7 @@ def _week_markup(cl: str) -> InlineKeyboardMarkup:
     )
 
 
+@lru_cache(maxsize=256)
 def _updates_markup(cl: str) -> InlineKeyboardMarkup:
     """Клавиатура для сообщения с обновлением расписания.
 
@@ -84,12 +89,29 @@ def _update_last_check(path: Path, timestamp: int) -> None:
         f.write(str(timestamp))
 
 
+async def _send_message(
+    bot: Bot, chat_id: int, text: str, markup: InlineKeyboardMarkup
+) -> None:
+    """Отправляет сообщение, выжидая ограничение частоты Telegram."""
+    try:
+        await bot.send_message(chat_id, text=text, reply_markup=markup)
+    except TelegramRetryAfter as e:
+        logger.warning("Flood control, retry after {}s", e.retry_after)
+        await asyncio.sleep(e.retry_after)
+        await bot.send_message(chat_id, text=text, reply_markup=markup)
+
+
 async def _wrap_update(
-    bot: Bot, hour: int, view: MessagesView, user: User
+    bot: Bot,
+    hour: int,
+    view: MessagesView,
+    user: User,
+    semaphore: asyncio.Semaphore,
 ) -> None:
     try:
         logger.debug("Process {}", user)
-        await process_update(bot, hour, view, user)
+        async with semaphore:
+            await process_update(bot, hour, view, user)
 
     except TelegramForbiddenError:
         await user.delete()
@@ -108,10 +130,11 @@ async def process_update(
     """
     if user.get_hour(hour):
         logger.debug("Send schedule")
-        await bot.send_message(
+        await _send_message(
+            bot,
             user.id,
-            text=view.today_lessons(await user.main_intent()),
-            reply_markup=_week_markup(user.cl),
+            view.today_lessons(await user.main_intent()),
+            _week_markup(user.cl),
         )
 
     updates = await view.check_updates(user)
@@ -119,9 +142,7 @@ async def process_update(
         return
 
     logger.debug("Send compare updates message")
-    await bot.send_message(
-        user.id, text=updates, reply_markup=_updates_markup(user.cl)
-    )
+    await _send_message(bot, user.id, updates, _updates_markup(user.cl))
 
 
 async def main() -> None:
@@ -134,20 +155,27 @@ async def main() -> None:
     bot = Bot(getenv("TELEGRAM_TOKEN"))  # pyright: ignore[reportArgumentType]
     view = MessagesView()
 
-    logger.add("sp_data/updates.log")
+    # Запись в файл журнала идёт в фоновом потоке, не тормозя рассылку
+    logger.add("sp_data/updates.log", enqueue=True)
     now = datetime.now(UTC)
 
     logger.info("Start of the update process...")
+    # Ограничиваем число одновременных отправок, чтобы не упираться
+    # в ограничения частоты запросов Telegram
+    semaphore = asyncio.Semaphore(_MAX_CONCURRENT_SENDS)
     tasks: list[asyncio.Future[None]] = []
     for user in await User.all():
         if not user.notify or not user.cl:
             continue
 
         tasks.append(
-            asyncio.create_task(_wrap_update(bot, now.hour, view, user))
+            asyncio.create_task(
+                _wrap_update(bot, now.hour, view, user, semaphore)
+            )
         )
     await asyncio.gather(*tasks)
     _update_last_check(_TIMETAG_PATH, int(now.timestamp()))
+    await logger.complete()
 
 
 # Запуск скрипта обновлений
@@ -5,6 +5,7 @@
 """
 
 from collections import Counter, defaultdict
+from collections.abc import Iterable
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any, TypeVar
@@ -60,9 +61,21 @@ class CounterTarget(Enum):
 
 
 _K = TypeVar("_K", int, str)
+_V = TypeVar("_V")
 CounterRes = dict[_K, CounterGroup]
 
 
+def _select(d: dict[str, _V], keys: frozenset[str]) -> Iterable[tuple[str, _V]]:
+    """Отбирает из словаря пары по ключам намерения.
+
+    Если ключи не указаны, возвращает все пары словаря.
+    Иначе обращается только к нужным ключам, не перебирая весь словарь.
+    """
+    if not keys:
+        return d.items()
+    return ((k, d[k]) for k in keys if k in d)
+
+
 def _group_counter_res(
     counter_res: CounterRes[_K],
 ) -> dict[int, CounterRes[_K]]:
@@ -113,8 +126,9 @@ class CurrentCounter:
         """
         res: dict[str, CounterGroup] = {}
         intent = intent or self.intent
+        f_cl, f_days = intent.cl, intent.days
         for cl, days in self.sc.schedule["lessons"].items():
-            if intent.cl and cl not in intent.cl:
+            if f_cl and cl not in f_cl:
                 continue
 
             day_counter: Counter[int] = Counter()
@@ -122,20 +136,18 @@ class CurrentCounter:
             cabinets_counter: Counter[str] = Counter()
 
             for day, lessons in enumerate(days):
-                if intent.days and day not in intent.days:
+                if f_days and day not in f_days:
                     continue
 
-                for lesson in lessons:
-                    lesson_cabinet = lesson.split(":")
-
-                    lessons_counter[lesson_cabinet[0]] += 1
-                    for cabinet in lesson_cabinet[1].split("/"):
-                        cabinets_counter[cabinet] += 1
-
+                pairs = [lesson.split(":") for lesson in lessons]
+                lessons_counter.update(x[0] for x in pairs)
+                cabinets_counter.update(
+                    cabinet for x in pairs for cabinet in x[1].split("/")
+                )
                 day_counter[day] = len(lessons)
 
             res[cl] = CounterGroup(
-                total=sum(day_counter.values()),
+                total=day_counter.total(),
                 cl=Counter(),
                 days=day_counter,
                 lessons=lessons_counter,
@@ -154,22 +166,24 @@ class CurrentCounter:
             for x in range(6)
         }
         intent = intent or self.intent
+        f_cl, f_days = intent.cl, intent.days
 
         for cl, days in self.sc.schedule["lessons"].items():
-            if intent.cl and cl not in intent.cl:
+            if f_cl and cl not in f_cl:
                 continue
 
             for day, lessons in enumerate(days):
-                if intent.days and day not in intent.days:
+                if not lessons or f_days and day not in f_days:
                     continue
 
-                for lesson in lessons:
-                    lesson_cabinet: list[str] = lesson.split(":")
-                    res[day].cl[cl] += 1
-                    res[day].lessons[lesson_cabinet[0]] += 1
-                    res[day].total += 1
-                    for x in lesson_cabinet[1].split("/"):
-                        res[day].cabinets[x] += 1
+                pairs = [lesson.split(":") for lesson in lessons]
+                group = res[day]
+                group.cl[cl] += len(pairs)
+                group.total += len(pairs)
+                group.lessons.update(x[0] for x in pairs)
+                group.cabinets.update(
+                    cabinet for x in pairs for cabinet in x[1].split("/")
+                )
 
         return _group_counter_res(res)
 
@@ -186,26 +200,20 @@ class CurrentCounter:
             lambda: CounterGroup(0, Counter(), Counter(), Counter(), Counter())
         )
         intent = intent or self.intent
-        for k, v in self.sc.l_index.items():
-            if intent.lessons and k not in intent.lessons:
-                continue
-
+        f_cl, f_days = intent.cl, intent.days
+        for k, v in _select(self.sc.l_index, intent.lessons):
+            group = res[k]
             for day, cabinets in enumerate(v):
-                if intent.days and day not in intent.days:
+                if f_days and day not in f_days:
                     continue
 
-                for cabinet, cl_s in cabinets.items():
-                    if intent.cabinets and cabinet not in intent.cabinets:
-                        continue
-
-                    for cl, i in cl_s.items():
-                        if intent.cl and cl not in intent.cl:
-                            continue
-
-                        res[k].total += len(i)
-                        res[k].cl[cl] += len(i)
-                        res[k].days[day] += len(i)
-                        res[k].lessons[cabinet] += len(i)
+                for cabinet, cl_s in _select(cabinets, intent.cabinets):
+                    for cl, i in _select(cl_s, f_cl):
+                        n = len(i)
+                        group.total += n
+                        group.cl[cl] += n
+                        group.days[day] += n
+                        group.lessons[cabinet] += n
 
         return _group_counter_res(res)
 
@@ -222,25 +230,19 @@ class CurrentCounter:
             lambda: CounterGroup(0, Counter(), Counter(), Counter(), Counter())
         )
         intent = intent or self.intent
-        for k, v in self.sc.c_index.items():
-            if intent.cabinets and k not in intent.cabinets:
-                continue
-
+        f_cl, f_days = intent.cl, intent.days
+        for k, v in _select(self.sc.c_index, intent.cabinets):
+            group = res[k]
             for day, lessons in enumerate(v):
-                if intent.days and day not in intent.days:
+                if f_days and day not in f_days:
                     continue
 
-                for lesson, cl_s in lessons.items():
-                    if intent.lessons and lesson not in intent.lessons:
-                        continue
-
-                    for cl, i in cl_s.items():
-                        if intent.cl and cl not in intent.cl:
-                            continue
-
-                        res[k].total += len(i)
-                        res[k].cl[cl] += len(i)
-                        res[k].days[day] += len(i)
-                        res[k].cabinets[lesson] += len(i)
+                for lesson, cl_s in _select(lessons, intent.lessons):
+                    for cl, i in _select(cl_s, f_cl):
+                        n = len(i)
+                        group.total += n
+                        group.cl[cl] += n
+                        group.days[day] += n
+                        group.cabinets[lesson] += n
 
         return _group_counter_res(res)
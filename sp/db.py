@@ -16,6 +16,8 @@ from sp.schedule import Schedule
 from sp.updates import UpdateData, compact_updates
 
 _HOUR_OFFSET = 6
+# Часы, в которые можно включить рассылку расписания
+NOTIFY_HOURS = tuple(range(_HOUR_OFFSET, 22))
 
 
 @dataclass(slots=True, frozen=True)
@@ -79,6 +81,9 @@ class User(Model):
     hours = fields.IntField(default=0)
     intents: fields.ReverseRelation[UserIntent]
 
+    # Намерение по умолчанию для экземпляра: (класс, намерение)
+    _main_intent: tuple[str, Intent] | None = None
+
     @classmethod
     async def get_stats(cls, sc: Schedule) -> CountedUsers:
         """Подсчитывает пользователей хранилища.
@@ -102,8 +107,7 @@ class User(Model):
             if user.notify:
                 notify_users += 1
 
-                for hour, status in user.get_hours():
-                    hour_counter[hour] += 1
+                hour_counter.update(user.get_active_hours())
 
                 if user.last_parse >= sc_last_parse:
                     active_users += 1
@@ -133,13 +137,15 @@ class User(Model):
         - Флаг установленного класса станет True.
         - Время последней проверки сравняется с временем расписания.
         """
-        if cl == "" or cl in sc.lessons:
+        if cl == "" or cl in sc.classes:
             self.cl = cl
             self.set_class = True
             self.last_parse = datetime.fromtimestamp(
                 sc.schedule["last_parse"], UTC
             )
-            await self.save()
+            await self.save(
+                update_fields=("cl", "set_class", "last_parse", "update_tome")
+            )
             return True
         return False
 
@@ -157,7 +163,7 @@ class User(Model):
         """
         self.cl = ""
         self.set_class = False
-        await self.save()
+        await self.save(update_fields=("cl", "set_class", "update_tome"))
 
     def get_hour(self, hour: int) -> bool:
         """Отправлять ли расписание в указанный час."""
@@ -173,7 +179,18 @@ class User(Model):
 
     def get_hours(self) -> Iterator[tuple[int, bool]]:
         """Получает в какие часы включено расписание."""
-        return ((hour, self.get_hour(hour)) for hour in range(6, 22))
+        return ((hour, self.get_hour(hour)) for hour in NOTIFY_HOURS)
+
+    def get_active_hours(self) -> Iterator[int]:
+        """Получает только часы, в которые включена рассылка.
+
+        Проходит лишь по установленным битам, по возрастанию часов.
+        """
+        hours = self.hours
+        while hours:
+            low = hours & -hours
+            yield low.bit_length() - 1 + _HOUR_OFFSET
+            hours ^= low
 
     def reset_hours(self) -> None:
         """Сбрасывает часы отправка расписания."""
@@ -204,12 +221,12 @@ class User(Model):
             return None
 
         logger.info("Get lessons updates")
-        i = Intent.construct(sc, cl=[self.cl])
+        i = sc.construct_intent(cl=self.cl)
         updates = sc.get_updates(i, int(self.last_parse.timestamp()))
 
         # Обновление времени последней проверки расписания
         self.last_parse = datetime.fromtimestamp(sc.schedule["last_parse"], UTC)
-        await self.save()
+        await self.save(update_fields=("last_parse", "update_tome"))
 
         if len(updates) != 0:
             return compact_updates(updates)
@@ -234,11 +251,21 @@ class User(Model):
         Для обратной совместимости пытается предоставить класс
         как намерение по умолчанию.
         В будущих версиях данный подход будет изменён.
+
+        Полученное намерение запоминается в экземпляре пользователя,
+        чтобы не запрашивать его повторно при обработке одного события.
+        Смена класса сбрасывает запомненное намерение.
         """
+        if self._main_intent is not None and self._main_intent[0] == self.cl:
+            return self._main_intent[1]
+
         intent_str = await self.intents.filter(name="main").get_or_none()
         if intent_str is not None:
-            return Intent.from_str(intent_str.intent)
-
-        if self.cl == "":
+            intent = Intent.from_str(intent_str.intent)
+        elif self.cl == "":
             raise ValueError("User not set class")
-        return Intent(cl={self.cl})
+        else:
+            intent = Intent(cl=frozenset((self.cl,)))
+
+        self._main_intent = (self.cl, intent)
+        return intent
@@ -9,6 +9,8 @@ from enum import IntEnum
 # Используются при обработке дней недели, а также в прочих компонентах
 DAY_NAMES = ("понедельник", "вторник", "среда", "четверг", "пятница", "суббота")
 SHORT_DAY_NAMES = ("пн", "вт", "ср", "чт", "пт", "сб")
+# Номера всех учебных дней недели
+ALL_DAYS = frozenset(range(len(DAY_NAMES)))
 
 
 class WeekDay(IntEnum):
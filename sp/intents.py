@@ -13,9 +13,10 @@ TODO: Портировать v7
 
 from collections.abc import Iterable
 from datetime import datetime
+from functools import lru_cache
 from typing import TYPE_CHECKING, NamedTuple, Self, TypeVar
 
-from sp.enums import DAY_NAMES, SHORT_DAY_NAMES
+from sp.enums import ALL_DAYS, DAY_NAMES, SHORT_DAY_NAMES
 
 if TYPE_CHECKING:
     from sp.schedule import Schedule
@@ -23,11 +24,45 @@ if TYPE_CHECKING:
 
 _T = TypeVar("_T")
 
+# Основы названий дней недели (полные и короткие) -> номер дня
+# У "среда", "пятница", "суббота" отбрасывается окончание: -у, -ы...
+_DAY_PREFIXES = {
+    name.removesuffix("а"): i
+    for names in (DAY_NAMES, SHORT_DAY_NAMES)
+    for i, name in enumerate(names)
+}
+# Длины названий, от длинных к коротким, для поиска по началу слова
+_DAY_PREFIX_LENGTHS = sorted({len(x) for x in _DAY_PREFIXES}, reverse=True)
+# Относительные дни -> сдвиг от текущего дня недели
+_RELATIVE_DAYS = {"сегодня": 0, "завтра": 1}
+
 
 def _ensure_list(a: _T) -> _T | tuple[str | int]:
     return (a,) if isinstance(a, str | int) else a
 
 
+def _filter_days(days: Iterable[int] | int) -> frozenset[int]:
+    """Оставляет только номера дней недели от 0 до 5.
+
+    Каждый день приводится к числу лишь один раз.
+    """
+    return ALL_DAYS.intersection(map(int, _ensure_list(days)))
+
+
+@lru_cache(maxsize=512)
+def _parse_day(arg: str) -> int | None:
+    """Получает номер дня недели по началу слова.
+
+    Если начало слова совпадает: пятниц... -а, -у, -ы...
+    Слова в запросах повторяются, потому результат запоминается.
+    """
+    for n in _DAY_PREFIX_LENGTHS:
+        day = _DAY_PREFIXES.get(arg[:n])
+        if day is not None:
+            return day
+    return None
+
+
 # Класс намерений
 # ===============
 
@@ -68,16 +103,16 @@ class Intent(NamedTuple):
     """
 
     #: Классы намерения (ссылка на индекс 0)
-    cl: set[str] = set()
+    cl: frozenset[str] = frozenset()
 
     #: Дни недели намерения 0-5 (понедельник-суббота) (ссылка на индекс 1)
-    days: set[int] = set()
+    days: frozenset[int] = frozenset()
 
     #: Уроки намерения, например матем (ссылка на индекс 2)
-    lessons: set[str] = set()
+    lessons: frozenset[str] = frozenset()
 
     #: Кабинеты расписания, например 328 (ссылка на индекс 3)
-    cabinets: set[str] = set()
+    cabinets: frozenset[str] = frozenset()
 
     def to_str(self) -> str:
         """Запаковывает намерение в строку.
@@ -98,6 +133,7 @@ class Intent(NamedTuple):
     # ====================================
 
     @classmethod
+    @lru_cache(maxsize=1024)
     def from_str(cls, s: str) -> Self:
         """Распаковывает намерение из строки.
 
@@ -124,23 +160,26 @@ class Intent(NamedTuple):
             валидацию передаваемых значений относительно расписания.
             Мы предполагаем что вы никак не изменяли запакованную строку.
 
+        Намерения пользователей загружаются на каждое нажатие кнопки,
+        потому результат распаковки кешируется по строке.
+
         Формат строки:
 
             ``cl,...:day,...:lessons,...:cabinets,cabinets2,cabinetsN``
 
         - "9в:1,2::" -> `Intent(cl=["9в"], days=[1, 2])`
         """
-        res: list[set[str]] = []
-        days: set[int] = set()
+        res: list[frozenset[str]] = []
+        days: frozenset[int] = frozenset()
         for i, part in enumerate(s.split(":")):
             # Если это пустая строка, добавляем пустое множество
             if part == "":
-                res.append(set())
+                res.append(frozenset())
             # Если это список дней, переводим в числа
             elif i == 1:
-                days = {int(x) for x in part.split(",")}
+                days = frozenset(int(x) for x in part.split(","))
             else:
-                res.append({x for x in part.split(",")})
+                res.append(frozenset(part.split(",")))
 
         return cls(res[0], days, res[1], res[2])
 
@@ -161,7 +200,7 @@ class Intent(NamedTuple):
         .. code-block:: python
 
             i = Intent.construct(sc, cl="8а")
-            # Intent({"8а"}, set(), set(), set())
+            # Intent(frozenset({"8а"}), frozenset(), frozenset(), frozenset())
 
             i = Intent.construct(sc, days=[2, 3], lessons="матем")
 
@@ -169,10 +208,12 @@ class Intent(NamedTuple):
         относительно текущего расписания.
         """
         return cls(
-            {str(x) for x in _ensure_list(cl) if x in sc.lessons},
-            {int(x) for x in _ensure_list(days) if int(x) < 6},  # noqa: PLR2004
-            {str(x) for x in _ensure_list(lessons) if x in sc.l_index},
-            {str(x) for x in _ensure_list(cabinets) if x in sc.c_index},
+            frozenset(str(x) for x in _ensure_list(cl) if x in sc.classes),
+            _filter_days(days),
+            frozenset(str(x) for x in _ensure_list(lessons) if x in sc.l_index),
+            frozenset(
+                str(x) for x in _ensure_list(cabinets) if x in sc.c_index
+            ),
         )
 
     @classmethod
@@ -195,6 +236,10 @@ class Intent(NamedTuple):
         days: list[int] = []
         lessons: list[str] = []
         cabinets: list[str] = []
+        # Свойства расписания читаются один раз, а не для каждого слова
+        classes = sc.classes
+        l_index = sc.l_index
+        c_index = sc.c_index
 
         # Получение аргументы
         for arg in args:
@@ -203,40 +248,35 @@ class Intent(NamedTuple):
                 continue
 
             # Дни недели
-            if arg == "сегодня":
-                days.append(weekday)
-
-            elif arg == "завтра":
-                today = weekday + 1
-                if today > 5:  # noqa: PLR2004
-                    today = 0
-
-                days.append(today)
+            offset = _RELATIVE_DAYS.get(arg)
+            if offset is not None:
+                # После субботы уроки будут только в понедельник
+                day = weekday + offset
+                days.append(day if day in ALL_DAYS else 0)
 
             elif arg.startswith("недел"):
-                days = [0, 1, 2, 3, 4, 5]
+                days = list(ALL_DAYS)
 
             # Подставляем классы
-            elif arg in sc.lessons:
+            elif arg in classes:
                 cl.append(arg)
 
             # Ищем по названию урока
-            elif arg in sc.l_index:
+            elif arg in l_index:
                 lessons.append(arg)
 
             # Ищем по кабинету
-            elif arg in sc.c_index:
+            elif arg in c_index:
                 cabinets.append(arg)
 
             else:
-                # Если начало слова совпадает: пятниц... -а, -у, -ы...
-                days += [
-                    i for i, k in enumerate(DAY_NAMES) if arg.startswith(k)
-                ]
-                days += [
-                    i
-                    for i, k in enumerate(SHORT_DAY_NAMES)
-                    if arg.startswith(k)
-                ]
-
-        return cls(set(cl), set(days), set(lessons), set(cabinets))
+                day = _parse_day(arg)
+                if day is not None:
+                    days.append(day)
+
+        return cls(
+            frozenset(cl),
+            frozenset(days),
+            frozenset(lessons),
+            frozenset(cabinets),
+        )
@@ -6,14 +6,16 @@ TODO: Хранилище расписания
 TODO: Хранилище обновлений
 """
 
+import asyncio
 import hashlib
+import sys
 from collections import defaultdict, deque
 from dataclasses import dataclass
 from datetime import UTC, datetime, time
+from http import HTTPStatus
 from pathlib import Path
 from typing import Any, TypedDict, TypeVar
 
-import openpyxl
 import requests
 import ujson
 from loguru import logger
@@ -38,6 +40,11 @@ LessonIndex = dict[str, list[dict[str, dict[str, list[int]]]]]
 ClassIndex = dict[str, list[dict[str, dict[str, list[int]]]]]
 SearchRes = list[list[list[str]]]
 
+# Замены для приведения названия урока к ключу индекса
+_LESSON_REPLACES = (("-", "="), (" ", "-"), (".-", "."))
+# Значения ячеек, которые обозначают отсутствие урока
+_EMPTY_LESSONS = frozenset(("---", "None"))
+
 
 def save_file(path: Path, data: _T) -> _T:
     """Записывает данные в json файл.
@@ -75,7 +82,8 @@ def load_file(path: Path, data: _T | None = None) -> _T:
         Данные методы будут перемещены.
     """
     try:
-        with open(path) as f:
+        # ujson разбирает байты сам, без отдельного декодирования в str
+        with open(path, "rb") as f:
             return ujson.loads(f.read())
     except FileNotFoundError:
         if data is not None:
@@ -97,12 +105,27 @@ def _clear_day_lessons(day_lessons: list[str]) -> list[str]:
     """Удаляет все пустые уроки с конца списка."""
     while day_lessons:
         lesson = day_lessons[-1].split(":")[0]
-        if lesson and lesson not in ("---", "None"):
+        if lesson and lesson not in _EMPTY_LESSONS:
             return day_lessons
         day_lessons.pop()
     return []
 
 
+def _intern_lessons(
+    lessons: dict[str, list[list[str]]],
+) -> dict[str, list[list[str]]]:
+    """Интернирует строки расписания.
+
+    Классы и уроки в расписании повторяются тысячи раз.
+    Интернирование оставляет в памяти по одной копии каждой строки.
+    """
+    intern = sys.intern
+    return {
+        intern(cl): [[intern(lesson) for lesson in day] for day in days]
+        for cl, days in lessons.items()
+    }
+
+
 def get_sc_updates(
     a: dict[str, list], b: dict[str, list]
 ) -> list[dict[str, list]]:
@@ -168,21 +191,23 @@ def get_index(
         lambda: [defaultdict(lambda: defaultdict(list)) for x in range(6)]
     )
 
+    intern = sys.intern
     for cl, v in sp_lessons.items():
         for day, lessons in enumerate(v):
             for n, lesson_data in enumerate(lessons):
                 lesson, cabinet = lesson_data.lower().split(":")
                 lesson = lesson.strip(" .")
-                for old, new in [("-", "="), (" ", "-"), (".-", ".")]:
+                for old, new in _LESSON_REPLACES:
                     lesson = lesson.replace(old, new)
 
                 # Obj - Первичный ключ индекса, урок или кабинет.
                 # another - = Вторичный ключ, противоположный первичному
+                # Ключи интернируются, как и строки самого расписания
                 obj = [lesson] if lessons_mode else cabinet.split("/")
-                another = cabinet if lessons_mode else lesson
+                another = intern(cabinet if lessons_mode else lesson)
 
                 for x in obj:
-                    index[x][day][another][cl].append(n)
+                    index[intern(x)][day][another][cl].append(n)
     return index
 
 
@@ -224,6 +249,9 @@ def parse_lessons() -> dict[str, list[list[str]]]:  # noqa: PLR0912
     lessons: dict[str, list] = defaultdict(lambda: [[] for x in range(6)])
     day = -1
     last_row = 8
+    # openpyxl тяжёлый, а нужен только при разборе новой таблицы
+    import openpyxl  # noqa: PLC0415
+
     sheet = openpyxl.load_workbook(str(RAW_SC_PATH)).active
     if sheet is None:
         raise ValueError("Loaded Schedule active tab is wrong")
@@ -284,6 +312,7 @@ class RawSchedule:
 
     hash: str
     data: str
+    etag: str | None = None
 
 
 class ScheduleDict(TypedDict):
@@ -312,27 +341,48 @@ class GoogleProvider(Provider):
         self._index_path = Path(index_path)
         self._timetable_path = Path(timetable_path)
         self._timetable: Timetable | None = None
+        self._timetable_mtime: float | None = None
+        self._next_timetable_check: int = 0
         self.next_parse: int | None = None
         self._schedule: Schedule | None = None
         self._updates: list[UpdateData] | None = None
+        self._etag: str | None = None
 
     def _load_timetable(self) -> Timetable:
         file: list[list[list[int]]] = load_file(self._timetable_path)
-        lessons: list[LessonTime] = []
-        for start, end in file:
-            lessons.append(
+        return Timetable(
+            [
                 LessonTime(time(start[0], start[1]), time(end[0], end[1]))
-            )
-        return Timetable(lessons)
+                for start, end in file
+            ]
+        )
+
+    def _get_timetable_mtime(self) -> float | None:
+        try:
+            return self._timetable_path.stat().st_mtime
+        except FileNotFoundError:
+            return None
 
     def update_timetable(self) -> None:
         """Обновляет расписание звонков."""
+        self._timetable_mtime = self._get_timetable_mtime()
         self._timetable = self._load_timetable()
 
     async def timetable(self) -> Timetable:
-        """Расписание звонков."""
-        if self._timetable is None:
-            self._timetable = self._load_timetable()
+        """Расписание звонков.
+
+        Изменение файла проверяется раз в полчаса, как и расписание.
+        Файл перечитывается только если он изменился с прошлой загрузки.
+        """
+        now = int(datetime.timestamp(datetime.now(UTC)))
+        if self._timetable is not None and self._next_timetable_check > now:
+            return self._timetable
+
+        self._next_timetable_check = now + 1800
+        mtime = await asyncio.to_thread(self._get_timetable_mtime)
+        if self._timetable is None or mtime != self._timetable_mtime:
+            self._timetable_mtime = mtime
+            self._timetable = await asyncio.to_thread(self._load_timetable)
 
         return self._timetable
 
@@ -341,8 +391,8 @@ class GoogleProvider(Provider):
 
     def _load_file(self) -> Schedule:
         file_data: ScheduleDict = load_file(self._sc_path)
-        self._updates = load_file(self._updates_path)
-        lessons: dict[str, list[list[str]]] = file_data["lessons"]
+        updates: list[UpdateData] = load_file(self._updates_path)
+        lessons = _intern_lessons(file_data["lessons"])
         l_index: LessonIndex = get_index(lessons)
         c_index: ClassIndex = get_index(lessons, False)
 
@@ -352,7 +402,7 @@ class GoogleProvider(Provider):
             file_data["last_parse"],
             l_index,
             c_index,
-            self._updates,
+            updates,
         )
 
     def _write_file(self, schedule: Schedule) -> None:
@@ -365,40 +415,60 @@ class GoogleProvider(Provider):
             },
         )
 
-    def _load_raw(self) -> RawSchedule:
+    def _load_raw(self, etag: str | None) -> RawSchedule | None:
+        """Загружает таблицу расписания.
+
+        Использует условный запрос по переданному ETag.
+        Если таблица не изменилась, возвращает None.
+        Новый ETag возвращается вместе с таблицей, а не сохраняется.
+        """
         logger.info("Download schedule csv_file ...")
         # TODO:Гле асинхронность я спрашиваю тебя
-        raw_data = requests.get(self.url).text
-        return RawSchedule(hashlib.md5(raw_data.encode()).hexdigest(), raw_data)
+        headers = {} if etag is None else {"If-None-Match": etag}
+        res = requests.get(self.url, headers=headers)
+        if res.status_code == HTTPStatus.NOT_MODIFIED:
+            return None
+
+        raw_data = res.text
+        return RawSchedule(
+            hashlib.md5(raw_data.encode()).hexdigest(),
+            raw_data,
+            res.headers.get("ETag"),
+        )
 
-    def _update_diff_file(self, a: ScheduleDict, b: ScheduleDict) -> None:
+    def _update_diff_file(
+        self,
+        a: dict[str, list[list[str]]],
+        b: dict[str, list[list[str]]],
+        now: int,
+        sc_updates: list[UpdateData],
+    ) -> list[UpdateData]:
         """Обновляет файл списка изменений расписания.
 
         Производит полное сравнение старого и нового расписания.
         После сравнения создаёт новую запись о найденных изменениях и
         добавляет её в файл списка изменений.
+
+        Принимает текущий список изменений из памяти поставщика и
+        возвращает новый, не изменяя состояние поставщика.
         """
         logger.info("Update diff file ...")
-        sc_changes: deque[UpdateData] = deque(
-            load_file(self._updates_path, []), 30
-        )
-        updates = get_sc_updates(a.get("lessons", {}), b["lessons"])
+        updates = get_sc_updates(a, b)
         if not sum(map(len, updates)):
-            return
-
-        if len(sc_changes):
-            start_time = sc_changes[-1]["end_time"]
-        else:
-            start_time = b["last_parse"]
+            return sc_updates
 
+        sc_changes: deque[UpdateData] = deque(sc_updates, 30)
+        start_time = sc_changes[-1]["end_time"] if sc_changes else now
         sc_changes.append(
             {
                 "start_time": start_time,
-                "end_time": b["last_parse"],
-                "updates": updates,
+                "end_time": now,
+                "updates": [dict(day) for day in updates],
             }
         )
-        save_file(self._updates_path, list(sc_changes))
+        res = list(sc_changes)
+        save_file(self._updates_path, res)
+        return res
 
     # 8< -----------------------------------------------------------------------
 
@@ -415,27 +485,56 @@ class GoogleProvider(Provider):
         изменений.
         """
         logger.info("Start schedule update ...")
-        raw = self._load_raw()
-        if self._schedule is not None and self._schedule.hash == raw.hash:
+        # Загрузка и разбор таблицы блокируют, выполняем их в потоке
+        raw = await asyncio.to_thread(self._load_raw, self._etag)
+        if self._schedule is not None and (
+            raw is None or self._schedule.hash == raw.hash
+        ):
             logger.info("Schedule is up to date")
+            if raw is not None:
+                self._etag = raw.etag
             self.next_parse = now + 1800
             return self._schedule
 
+        if raw is None:
+            # Без загруженного расписания ответ 304 бесполезен
+            raw = await asyncio.to_thread(self._load_raw, None)
+            if raw is None:
+                raise ValueError("Schedule not modified, but not loaded")
+
         self.next_parse = now + 1800
-        lessons = parse_lessons()
+        sc_updates = self._updates
+        if sc_updates is None:
+            sc_updates = await asyncio.to_thread(
+                load_file, self._updates_path, []
+            )
+
+        # Состояние поставщика меняется только здесь, не в потоке
+        # ETag запоминается лишь после успешной сборки расписания,
+        # иначе следующий запрос получит 304 и изменения потеряются
+        try:
+            sc = await asyncio.to_thread(
+                self._build_schedule, raw, now, sc_updates
+            )
+        except Exception:
+            self._etag = None
+            raise
+
+        self._etag = raw.etag
+        self._updates = sc.updates
+        return sc
+
+    def _build_schedule(
+        self, raw: RawSchedule, now: int, sc_updates: list[UpdateData]
+    ) -> Schedule:
+        """Собирает новое расписание и обновляет файлы расписания."""
+        lessons = _intern_lessons(parse_lessons())
         l_index: LessonIndex = get_index(lessons)
         c_index: ClassIndex = get_index(lessons, False)
+        old_lessons = {} if self._schedule is None else self._schedule.schedule
+        updates = self._update_diff_file(old_lessons, lessons, now, sc_updates)
 
-        sc = Schedule(
-            lessons,
-            raw.hash,
-            now,
-            l_index,
-            c_index,
-            self._updates,
-        )
-
-        self._update_diff_file(sc)
+        sc = Schedule(lessons, raw.hash, now, l_index, c_index, updates)
         self._write_file(sc)
         return sc
 
@@ -448,7 +547,9 @@ class GoogleProvider(Provider):
         """Возвращает расписание уроков."""
         now = int(datetime.timestamp(datetime.now(UTC)))
         if self._schedule is None:
-            self._schedule = self._load_file()
+            # Чтение файла и сборка индексов блокируют цикл событий
+            self._schedule = await asyncio.to_thread(self._load_file)
+            self._updates = self._schedule.updates
 
         if self.next_parse is None or self.next_parse < now:
             self._schedule = await self._load_schedule(now)
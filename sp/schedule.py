@@ -5,9 +5,12 @@
 изменений, сборка индекс и поиск по расписанию.
 """
 
-from collections.abc import Iterable
+from collections.abc import Hashable, Iterable, Sequence
+from datetime import datetime
+from functools import cached_property
 from typing import TypedDict
 
+from sp.enums import ALL_DAYS
 from sp.intents import Intent
 from sp.updates import UpdateData
 
@@ -28,6 +31,18 @@ LessonIndex = dict[str, list[dict[str, dict[str, list[int]]]]]
 ClassIndex = dict[str, list[dict[str, dict[str, list[int]]]]]
 SearchRes = list[list[list[str]]]
 
+# Сколько разобранных запросов хранить для одного расписания
+_INTENTS_CACHE_SIZE = 2048
+# Сколько отфильтрованных списков изменений хранить для расписания
+_UPDATES_CACHE_SIZE = 256
+# Расписание на неделю для класса, которого нет в расписании
+_EMPTY_WEEK: tuple[tuple[str, ...], ...] = ((),) * 6
+
+
+def _as_key(a: Iterable[str | int] | str | int) -> Hashable:
+    """Приводит аргумент сборки намерения к хешируемому ключу."""
+    return a if isinstance(a, str | int) else tuple(a)
+
 
 class Schedule:
     """Предоставляет доступ к расписанию уроков.
@@ -57,6 +72,12 @@ class Schedule:
         self._l_index = l_index
         self._c_index = c_index
         self._updates = updates
+        self._parsed_intents: dict[tuple[int, tuple[str, ...]], Intent] = {}
+        self._constructed_intents: dict[tuple[Hashable, ...], Intent] = {}
+        self._filtered_updates: dict[
+            tuple[frozenset[str], frozenset[int], int | None],
+            list[UpdateData],
+        ] = {}
 
     @property
     def schedule(self) -> dict[str, list[list[str]]]:
@@ -89,7 +110,6 @@ class Schedule:
     def l_index(self) -> LessonIndex:
         """Индекс уроков.
 
-        Загружает индекс уроков из файла.
         Индекс урока предоставляет изменённый словарь расписания,
         где вместо ключа используется название урока, а не класс.
 
@@ -114,15 +134,12 @@ class Schedule:
             }
         ```
         """
-        if self._l_index is None:
-            self._l_index = load_file(self.index_path)[0]
         return self._l_index
 
     @property
     def c_index(self) -> ClassIndex:
         """Индекс кабинетов.
 
-        Загружает индекс кабинетов из файла.
         Индекс кабинетов предоставляет изменённый словарь расписания,
         где вместо ключа используется название кабинета, а не класс.
 
@@ -147,15 +164,12 @@ class Schedule:
         }
         ```
         """
-        if self._c_index is None:
-            self._c_index = load_file(self.index_path)[1]
         return self._c_index
 
     @property
     def updates(self) -> list[UpdateData] | None:
         """Список изменений в расписании.
 
-        Загружает полный список изменений из файла.
         Список изменений представляет собой перечень последних 30-ти
         зафиксированных изменений.
         Включая время начала и конца временного промежутка, когда эти
@@ -189,15 +203,25 @@ class Schedule:
         }
         ```
         """
-        if self._updates is None:
-            file_data: list[UpdateData] = load_file(self.updates_path)
-            if not isinstance(file_data, list):
-                raise ValueError("Incorrect updates list")
-            self._updates = file_data
         return self._updates
 
+    @cached_property
+    def classes(self) -> frozenset[str]:
+        """Множество классов, представленных в расписании.
+
+        Используется для быстрой проверки существования класса.
+        Поскольку при обновлении создаётся новое расписание, множество
+        не требуется сбрасывать.
+        """
+        return frozenset(self._schedule)
+
+    @cached_property
+    def classes_str(self) -> str:
+        """Перечень всех классов через запятую для сообщений."""
+        return ", ".join(self._schedule)
+
     # TODO: Переработать метод
-    def lessons(self, cl: str | None = None) -> list[list[str]]:
+    def lessons(self, cl: str | None = None) -> Sequence[Sequence[str]]:
         """Получает полное расписание уроков для указанного класса.
 
         .. deprecated:: 5.8 Данный метод может быть переработан
@@ -211,10 +235,11 @@ class Schedule:
         расписание на неделю.
         Обратите внимание, что даже при неправильном классе результат
         вернётся корректный.
+        Пустая неделя общая для всех вызовов и неизменяемая.
         """
         if cl is None:
             raise ValueError("User class let is None")
-        return self.lessons.get(cl, [[], [], [], [], [], []])
+        return self._schedule.get(cl, _EMPTY_WEEK)
 
     def get_updates(
         self, intent: Intent, offset: int | None = None
@@ -236,12 +261,35 @@ class Schedule:
 
         Ежели ваша цель - просто получить список всех изменений в
         расписании, то воспользуйтесь аттрибутом ``updates``.
+
+        Отфильтрованный список запоминается для текущего расписания,
+        чтобы листание страниц не проходило весь список заново.
+        Из намерения учитываются только классы и дни.
+        Полученный список общий для всех вызовов, не изменяйте его.
         """
+        key = (intent.cl, intent.days, offset)
+        updates = self._filtered_updates.get(key)
+        if updates is None:
+            if len(self._filtered_updates) >= _UPDATES_CACHE_SIZE:
+                self._filtered_updates.clear()
+            updates = self._filter_updates(intent, offset)
+            self._filtered_updates[key] = updates
+        return updates
+
+    def _filter_updates(
+        self, intent: Intent, offset: int | None
+    ) -> list[UpdateData]:
+        """Отбирает записи об изменениях по намерению и сдвигу."""
         updates: list[UpdateData] = []
 
         if self.updates is None:
             raise ValueError("Updates list is None. Updates file broken?")
 
+        # Проходим только по дням и классам из намерения
+        # Намерения из базы данных могут хранить дни вне недели
+        days = ALL_DAYS.intersection(intent.days) if intent.days else ALL_DAYS
+        classes = intent.cl
+
         # Пробегаемся по списку обновлений
         for update in self.updates:
             if update is None:
@@ -253,18 +301,18 @@ class Schedule:
 
             # Собираем новый список изменений, используя намерения
             new_update: list[dict[str, list[str]]] = [{} for x in range(6)]
-            for day, day_updates in enumerate(update["updates"]):
-                if intent.days and day not in intent.days:
-                    continue
-
-                for cl, cl_updates in day_updates.items():
-                    if intent.cl and cl not in intent.cl:
-                        continue
-
-                    new_update[day][cl] = cl_updates
+            update_days = update["updates"]
+            for day in days:
+                day_updates = update_days[day]
+                # Классы остаются в порядке записи об изменениях
+                new_update[day] = (
+                    {k: v for k, v in day_updates.items() if k in classes}
+                    if classes
+                    else dict(day_updates)
+                )
 
             # Если в итоге какие-то обновления есть - добавляем
-            if sum(map(len, new_update)):
+            if any(new_update):
                 updates.append(
                     {
                         "start_time": update["start_time"],
@@ -310,18 +358,21 @@ class Schedule:
                 [], // Если список пустой - ничего не найдено
                 // Дальше все прочие уроки.
             ],
-            [], // Вторник ...
+            [], // Вторник: ничего не найдено, уроки дня не создаются
             // Среда ...
         ]
         ```
 
+        День без результатов - пустой список, а не 8 пустых уроков.
+
         Формат строки результата зависит от некоторых условий:
 
         - ``{cl}`` - Если в намерении 1 кабинет и указаны уроки.
         - ``{obj}`` - Если в намерении 1 класс (опускаем описание класса).
         - ``{cl}:{obj}`` - Для всех прочих случаев.
         """
-        res: SearchRes = [[[] for x in range(8)] for x in range(6)]
+        # Уроки дня создаются только при первом найденном результате
+        res: SearchRes = [[] for x in range(6)]
 
         # Определяем какой индекс использовать
         target_index = self.c_index if cabinets else self.l_index
@@ -332,23 +383,46 @@ class Schedule:
             if intent.days and day not in intent.days:
                 continue
 
-            for obj, another in objs.items():
-                if cabinets and intent.lessons and obj not in intent.lessons:
-                    continue
-
-                for cl, i in another.items():
-                    if intent.cl and cl not in intent.cl:
-                        continue
-
-                    for x in i:
-                        if len(intent.cabinets) == 1 and len(intent.lessons):
-                            res[day][x].append(f"{cl}")
-                        elif len(intent.cl) == 1:
-                            res[day][x].append(f"{obj}")
-                        else:
-                            res[day][x].append(f"{cl}:{obj}")
+            res[day] = self._search_day(objs, intent, cabinets=cabinets)
         return res
 
+    def _search_day(
+        self, objs: dict, intent: Intent, *, cabinets: bool | None
+    ) -> list[list[str]]:
+        """Собирает результаты поиска для одного дня.
+
+        Если ничего не найдено, возвращает пустой список без уроков.
+        """
+        # Формат результата зависит только от намерения
+        only_cl = len(intent.cabinets) == 1 and len(intent.lessons) > 0
+        only_obj = not only_cl and len(intent.cl) == 1
+
+        day_res: list[list[str]] = []
+        for obj, another in objs.items():
+            if cabinets and intent.lessons and obj not in intent.lessons:
+                continue
+
+            # Классы идут в порядке индекса, а не множества из намерения
+            if intent.cl:
+                cl_s = [(k, v) for k, v in another.items() if k in intent.cl]
+            else:
+                cl_s = another.items()
+
+            for cl, i in cl_s:
+                if not day_res:
+                    day_res = [[] for x in range(8)]
+
+                if only_cl:
+                    entry = cl
+                elif only_obj:
+                    entry = obj
+                else:
+                    entry = f"{cl}:{obj}"
+
+                for x in i:
+                    day_res[x].append(entry)
+        return day_res
+
     # Работа с намерениями
     # TODO: Удалить после переноса намерений
     # ====================
@@ -369,8 +443,19 @@ class Schedule:
             # Можно использовать любой вариант
             i = Intent.construct(sc, ...)
             i = sc.construct_intent(...)
+
+        Собранные намерения запоминаются для текущего расписания,
+        поскольку обработчики собирают одни и те же намерения для
+        классов при каждом нажатии на кнопку.
         """
-        return Intent.construct(self, cl, days, lessons, cabinets)
+        key = (_as_key(cl), _as_key(days), _as_key(lessons), _as_key(cabinets))
+        intent = self._constructed_intents.get(key)
+        if intent is None:
+            if len(self._constructed_intents) >= _INTENTS_CACHE_SIZE:
+                self._constructed_intents.clear()
+            intent = Intent.construct(self, cl, days, lessons, cabinets)
+            self._constructed_intents[key] = intent
+        return intent
 
     def parse_intent(self, args: Iterable[str]) -> Intent:
         """Парсит намерение из строковых аргументов.
@@ -382,5 +467,17 @@ class Schedule:
             # Можно использовать любой вариант
             i = Intent.parse(sc, args)
             i = sc.parse_intent(args)
+
+        Пользователи часто повторяют одни и те же запросы, потому
+        результат запоминается для текущего расписания.
+        Ключом служит день недели (от него зависят "сегодня" и "завтра")
+        и сами аргументы.
         """
-        return Intent.parse(self, args)
+        key = (datetime.today().weekday(), tuple(args))  # noqa: DTZ002
+        intent = self._parsed_intents.get(key)
+        if intent is None:
+            if len(self._parsed_intents) >= _INTENTS_CACHE_SIZE:
+                self._parsed_intents.clear()
+            intent = Intent.parse(self, key[1])
+            self._parsed_intents[key] = intent
+        return intent
@@ -31,7 +31,8 @@ def compact_updates(updates: list[UpdateData]) -> UpdateData:
     - Если A -> B, B -> C, то A => C.
     - Иначе добавить запись.
     """
-    res: WeekUpdatesT = updates[0]["updates"].copy()
+    # Копируем дни, чтобы не изменять исходные записи
+    res: WeekUpdatesT = [dict(day) for day in updates[0]["updates"]]
 
     # Просматриваем все последующии записи об обновлениях
     for update_data in updates[1:]:
@@ -9,17 +9,23 @@
 from collections import Counter, defaultdict
 from collections.abc import Iterable
 from datetime import UTC, datetime, time
+from time import gmtime
 
 from sp.counter import CounterTarget, reverse_counter
 from sp.db import User
 from sp.enums import DAY_NAMES, SHORT_DAY_NAMES, WeekDay
 from sp.intents import Intent
 from sp.schedule import Schedule
-from sp.timetable import LessonTime, Timetable
+from sp.timetable import IndexedLessonTime, LessonTime, Timetable
 from sp.updates import UpdateData
 from sp.view.base import View
 
-_EMPTY_LESSONS = ("---", "None")
+_EMPTY_LESSONS = frozenset(("---", "None"))
+# Сколько записей об изменениях хранить в кеше собранных сообщений
+_UPDATE_TEXTS_CACHE_SIZE = 128
+# Заголовки дней недели для расписания и списка изменений
+_DAY_HEADERS = tuple(f"\n📅 На {x}:" for x in DAY_NAMES)
+_UPDATE_DAY_HEADERS = tuple(f"\n🔷 На {x}" for x in DAY_NAMES)
 
 # Максимальные отображаемый диапазон временного промежутка (2 дня)
 # Максимально отображаемое прошедшее время обновления (24 часа)
@@ -70,36 +76,38 @@ def _send_cl_updates(cl_updates: list[list[str] | None]) -> str:
     - `{l}:({oc} -> {c})` - Если сменился только кабинет, без урока.
     - `{ol}:{oc} -> {l}:{c}` - Изменилось всё (прочий случай).
     """
-    message = ""
-    for i, u in enumerate(cl_updates):
+    res: list[str] = []
+    for i, u in enumerate(cl_updates, 1):
         if u is None:
             continue
 
+        # Старый и новый урок приводятся к строке лишь один раз
+        old, new = str(u[0]), str(u[1])
+
         # Если урок не был выбран
-        if str(u[0]) == "None":
-            message += f"{i + 1}: ++{u[1]}\n"
+        if old == "None":
+            res.append(f"{i}: ++{new}\n")
             continue
 
-        message += f"{i + 1}: "
-        ol, oc = str(u[0]).split(":")
-        l, c = str(u[1]).split(":")  # noqa: E741
+        ol, oc = old.split(":")
+        l, c = new.split(":")  # noqa: E741
 
         # Если добавился урок в расписание
         if ol in _EMPTY_LESSONS:
-            message += f"++{u[1]}\n"
+            res.append(f"{i}: ++{new}\n")
         # Если урок удалился
         elif l in _EMPTY_LESSONS:
-            message += f"--{u[0]}\n"
+            res.append(f"{i}: --{old}\n")
         # Если в расписании изменился только урок
         elif oc == c:
-            message += f"{ol} ➜ {l}:{c}\n"
+            res.append(f"{i}: {ol} ➜ {new}\n")
         # Если сменился только урок, без кабинета
         elif ol == l:
-            message += f"{l}: ({oc} ➜ {c})\n"
+            res.append(f"{i}: {l}: ({oc} ➜ {c})\n")
         else:
-            message += f"{u[0]} ➜ {u[1]}\n"
+            res.append(f"{i}: {old} ➜ {new}\n")
 
-    return message
+    return "".join(res)
 
 
 def _get_update_header(
@@ -136,12 +144,13 @@ def _get_update_header(
     if not isinstance(start_timestamp, int):
         raise ValueError("Start update timestamp value must be integer")
 
-    e_time = datetime.fromtimestamp(end_timestamp, UTC)
-    s_time = datetime.fromtimestamp(start_timestamp, UTC)
-    message = f"📀 {s_time.strftime('%d.%m %H:%M')} "
-
-    t = e_time.strftime("%d.%m %H:%M" if s_time.day != e_time.day else "%H:%M")
-    message += f"➜ {t}"
+    # struct_time дешевле объекта datetime и разбора формата strftime
+    e = gmtime(end_timestamp)
+    s = gmtime(start_timestamp)
+    message = f"📀 {s.tm_mday:02}.{s.tm_mon:02} {s.tm_hour:02}:{s.tm_min:02} ➜ "
+    if s.tm_mday != e.tm_mday:
+        message += f"{e.tm_mday:02}.{e.tm_mon:02} "
+    message += f"{e.tm_hour:02}:{e.tm_min:02}"
 
     if extend_info:
         update_delta = int(end_timestamp - start_timestamp)
@@ -160,15 +169,8 @@ def _get_update_header(
     return message
 
 
-def send_search_res(intent: Intent, res: list) -> str:
-    """Собирает сообщение с результатами поиска в расписании.
-
-    Является некоторой обёрткой над функцией send_day_lessons.
-    Собирает заголовок поискового запроса и возвращает результаты
-    поиска.
-    Передайте сюда намерение, которое использовалось при поиске.
-    Поскольку оно будет использовано также для сборки заголовка.
-    """
+def _get_search_header(intent: Intent) -> str:
+    """Собирает заголовок поискового запроса по намерению."""
     message = "🔎 Поиск "
     if intent.cabinets:
         message += f" [{', '.join(intent.cabinets)}]"
@@ -176,17 +178,6 @@ def send_search_res(intent: Intent, res: list) -> str:
         message += f" ({', '.join(intent.cl)})"
     if intent.lessons:
         message += f" ({', '.join(intent.lessons)})"
-
-    for day, lessons in enumerate(res):
-        while lessons and not lessons[-1]:
-            lessons.pop()
-
-        if not lessons:
-            continue
-
-        message += f"\n\n📅 На {DAY_NAMES[day]}:"
-        message += send_day_lessons(lessons)
-
     return message
 
 
@@ -203,15 +194,13 @@ def _get_next_update_str(time: datetime, now: datetime | None = None) -> str:
 
 
 def _get_cl_counter_str(cl_counter: Counter[str]) -> str:
-    groups = defaultdict(list)
+    groups: dict[int, list[str]] = defaultdict(list)
     for k, v in cl_counter.items():
         groups[v].append(str(k))
 
-    res = []
-    for k, v in sorted(groups.items(), key=lambda x: int(x[0])):
-        res.append(f" 🔹{k} ({', '.join(v)})")
-
-    return "".join(res)
+    return "".join(
+        [f" 🔹{k} ({', '.join(v)})" for k, v in sorted(groups.items())]
+    )
 
 
 def _get_hour_counter_str(hour_counter: Counter[int]) -> str:
@@ -219,13 +208,31 @@ def _get_hour_counter_str(hour_counter: Counter[int]) -> str:
     for k, v in hour_counter.items():
         groups[v].append(str(k))
 
-    res = []
-    for k, v in groups.items():
-        if k == 1:
-            res.append(f" 🔸{', '.join(v)}")
+    return "".join(
+        [
+            f" 🔸{', '.join(v)}" if k == 1 else f" 🔹{k} ({', '.join(v)})"
+            for k, v in groups.items()
+        ]
+    )
+
+
+def _get_subgroup_str(
+    cnt_groups: dict[int, list[str]], group: int, *, days: bool
+) -> str:
+    res: list[str] = []
+    for cnt_group, k in sorted(cnt_groups.items(), reverse=True):
+        # Заменяем числа на дни недели в подгруппу счётчика
+        if days:
+            count_items = " ".join(SHORT_DAY_NAMES[int(x)] for x in sorted(k))
         else:
-            res.append(f" 🔹{k} ({', '.join(v)})")
+            count_items = " ".join(sorted(k))
 
+        if cnt_group == 1:
+            res.append(f" 🔸{count_items}")
+        elif cnt_group == group:
+            res.append(f" 🔹{count_items}")
+        else:
+            res.append(f" 🔹{cnt_group}:{count_items}")
     return "".join(res)
 
 
@@ -253,6 +260,16 @@ class MessagesView(View[str]):
                 LessonTime(time(14, 10), time(14, 50)),
             ]
         )
+        # Время начала и конца каждого урока, уже в виде строк
+        self._lesson_times = [
+            (x.start.strftime(" %H:%M -"), x.end.strftime(" %H:%M"))
+            for x in self.timetable.lessons
+        ]
+        # Собранные сообщения изменений: id записи -> (запись, тексты)
+        # Запись хранится вместе с текстами, чтобы id не переиспользовался
+        self._update_texts: dict[
+            int, tuple[UpdateData, dict[str | None, str]]
+        ] = {}
 
     async def get_status(self, user: User) -> str:
         """Возвращает информацию о платформе.
@@ -301,7 +318,7 @@ class MessagesView(View[str]):
             f"\n{_get_cl_counter_str(storage_users.cl)}"
         )
 
-        other_cl = sorted(set(self.sc.lessons) - set(storage_users.cl))
+        other_cl = sorted(self.sc.classes - set(storage_users.cl))
         if other_cl:
             res += f" 🔸{', '.join(other_cl)}"
         if len(storage_users.hour) > 0:
@@ -315,15 +332,20 @@ class MessagesView(View[str]):
 
         Обёртка над методом класса Schedule для получения расписания.
         Принимает намерения, для уточнения форматов расписание.
-        Форматирует сообщений с помощью send_day_lessons.
+        Форматирует сообщений с помощью _day_lessons.
+        Расписание классов и текущий урок получаются один раз на
+        всё сообщение, а не для каждого дня.
+        Дни и классы идут по порядку, независимо от порядка в намерении.
         """
-        lessons = {x: self.sc.lessons(x) for x in intent.cl}
+        lessons = {x: self.sc.lessons(x) for x in sorted(intent.cl)}
+        now = datetime.now(UTC).time()
+        cur = self.timetable.current(now)
         message = ""
-        for day in intent.days:
-            message += f"\n📅 На {DAY_NAMES[day]}:"
+        for day in sorted(intent.days):
+            message += _DAY_HEADERS[day]
             for cl, cl_lessons in lessons.items():
                 message += f"\n🔶 Для {cl}:"
-                message += f"{send_day_lessons(cl_lessons[day])}"
+                message += self._day_lessons(cl_lessons[day], now, cur)
             message += "\n"
         return message
 
@@ -399,7 +421,7 @@ class MessagesView(View[str]):
         return self.lessons(
             Intent(
                 cl=intent.cl,
-                days=(self.current_day(intent),),
+                days=frozenset((self.current_day(intent),)),
                 lessons=intent.lessons,
                 cabinets=intent.cabinets,
             )
@@ -422,8 +444,30 @@ class MessagesView(View[str]):
         +----------+---------+---------+
         | true     | cabinet | lesson  |
         +----------+---------+---------+
+
+        Уроки каждого дня собираются через _day_lessons, как и в
+        обычном расписании.
         """
-        return send_search_res(intent, self.sc.search(target, intent, cabinets))
+        res = self.sc.search(target, intent, cabinets)
+        now = datetime.now(UTC).time()
+        cur = self.timetable.current(now)
+        message = [_get_search_header(intent)]
+        for day, lessons in enumerate(res):
+            # День без результатов поиск возвращает пустым списком
+            if not lessons:
+                continue
+
+            # Пустые уроки в конце дня не отображаются
+            last = next(
+                (i for i in range(len(lessons) - 1, -1, -1) if lessons[i]), -1
+            )
+            if last < 0:
+                continue
+
+            message.append(f"\n{_DAY_HEADERS[day]}")
+            message.append(self._day_lessons(lessons[: last + 1], now, cur))
+
+        return "".join(message)
 
     def update(self, update: UpdateData, hide_cl: str | None = None) -> str:
         """Собирает сообщение со списком изменений в расписании.
@@ -452,24 +496,43 @@ class MessagesView(View[str]):
         🔷 На четверг
         2: --физкульт:330
         ```
+
+        Собранные сообщения запоминаются для каждой записи, поскольку
+        при листании списка изменений одни и те же страницы
+        отображаются повторно.
         """
-        message = _get_update_header(update)
+        cached = self._update_texts.get(id(update))
+        if cached is None or cached[0] is not update:
+            if len(self._update_texts) >= _UPDATE_TEXTS_CACHE_SIZE:
+                self._update_texts.clear()
+            cached = (update, {})
+            self._update_texts[id(update)] = cached
+
+        message = cached[1].get(hide_cl)
+        if message is None:
+            message = self._update_text(update, hide_cl)
+            cached[1][hide_cl] = message
+        return message
+
+    def _update_text(self, update: UpdateData, hide_cl: str | None) -> str:
         updates = update.get("updates", [])
         if not isinstance(updates, (list)):
             raise ValueError("Updates must be a list of lessons")
+
+        res = [_get_update_header(update)]
         for day, day_updates in enumerate(updates):
             if not day_updates:
                 continue
 
-            message += f"\n🔷 На {DAY_NAMES[day]}"
+            res.append(_UPDATE_DAY_HEADERS[day])
             for u_cl, cl_updates in day_updates.items():
-                if hide_cl is None or hide_cl is not None and hide_cl != u_cl:
-                    message += f"\n🔸 Для {u_cl}:"
+                if hide_cl is None or hide_cl != u_cl:
+                    res.append(f"\n🔸 Для {u_cl}:")
 
-                message += "\n" if len(cl_updates) > 1 else " "
-                message += _send_cl_updates(cl_updates)
+                res.append("\n" if len(cl_updates) > 1 else " ")
+                res.append(_send_cl_updates(cl_updates))
 
-        return message
+        return "".join(res)
 
     async def check_updates(self, user: User) -> str | None:
         """Проверяет обновления пользователя в расписании.
@@ -498,63 +561,54 @@ class MessagesView(View[str]):
         к меньшему.
         Если указана подгруппу (target), то она также буде включена в
         результаты счётчика.
+        Элементы с равным счётом идут по алфавиту, чтобы порядок не
+        менялся от запуска к запуску.
         """
-        message = ""
+        message: list[str] = []
 
-        for group, res in sorted(
-            groups.items(), key=lambda x: x[0], reverse=True
-        ):
+        # Ключи групп уникальны, потому пары сортируются без key
+        for group, res in sorted(groups.items(), reverse=True):
             group_plural_form = plural_form(group, ("раз", "раза", "раз"))
-            message += f"\n🔘 {group} {group_plural_form}:"
+            message.append(f"\n🔘 {group} {group_plural_form}:")
 
             # проверяем подгруппу
             if target is not None or target is CounterTarget.NONE:
-                for obj, cnt in res.items():
+                for obj, cnt in sorted(res.items()):
                     if len(res) > 1:
-                        message += "\n--"
+                        message.append("\n--")
 
                     # Заменяем числа на название дней недели для счётчика дней.
                     # Подумайте сами, что лучше, 1 или вт.
                     if days_counter:
-                        message += f" {SHORT_DAY_NAMES[int(obj)]}:"
+                        message.append(f" {SHORT_DAY_NAMES[int(obj)]}:")
                     else:
-                        message += f" {obj}:"
-
-                    cnt_groups = reverse_counter(cnt.get(target.value, {}))
-
-                    for cnt_group, k in sorted(
-                        cnt_groups.items(), key=lambda x: x[0], reverse=True
-                    ):
-                        # Заменяем числа на дни недели в подгруппу счётчика
-                        if target == CounterTarget.DAYS:
-                            count_items = " ".join(
-                                SHORT_DAY_NAMES[int(x)] for x in k
-                            )
-                        else:
-                            count_items = " ".join(k)
-
-                        if cnt_group == 1:
-                            message += f" 🔸{count_items}"
-                        elif cnt_group == group:
-                            message += f" 🔹{count_items}"
-                        else:
-                            message += f" 🔹{cnt_group}:{count_items}"
-
-                message += "\n"
+                        message.append(f" {obj}:")
+
+                    message.append(
+                        _get_subgroup_str(
+                            reverse_counter(cnt.get(target.value, {})),
+                            group,
+                            days=target == CounterTarget.DAYS,
+                        )
+                    )
+
+                message.append("\n")
 
             # Заменяем числа на название дней недели для счётчика по дням
             elif days_counter:
-                message += (
-                    f" {', '.join([SHORT_DAY_NAMES[int(x)] for x in res])}"
-                )
+                days = [SHORT_DAY_NAMES[int(x)] for x in sorted(res)]
+                message.append(f" {', '.join(days)}")
             else:
-                message += f" {', '.join(res)}"
+                message.append(f" {', '.join(sorted(res))}")
 
-        return message
+        return "".join(message)
 
-    def _day_lessons(self, lessons: Iterable[list[str] | str]) -> str:
-        now = datetime.now(UTC).time()
-        cur = self.timetable.current(now)
+    def _day_lessons(
+        self,
+        lessons: Iterable[list[str] | str],
+        now: time,
+        cur: IndexedLessonTime,
+    ) -> str:
         message = ""
 
         for i, lesson in enumerate(lessons):
@@ -565,15 +619,20 @@ class MessagesView(View[str]):
             else:
                 cursor = f"{i + 1}."
 
+            if i < len(self._lesson_times):
+                start, end = self._lesson_times[i]
+            else:
+                start, end = "", ""
+
             message += f"\n{cursor}"
             if cur.index < i:
-                message += cur.start.strftime(" %H:%M -")
+                message += start
 
-            message += cur.end.strftime(" %H:%M")
-            message += " │ " if cur.lesson_index < i else " ┃ "
+            message += end
+            message += " │ " if cur.index < i else " ┃ "
 
             if isinstance(lesson, list):
-                message += "; ".join(x)
+                message += "; ".join(lesson)
             elif len(lesson) > 0 and lesson.split(":")[0] not in _EMPTY_LESSONS:
                 message += lesson
 
@@ -18,6 +18,7 @@
 - delete_msg: Удалить сообщение или отправить главный раздел.
 """
 
+import asyncio
 from collections.abc import Awaitable, Callable
 from datetime import UTC, datetime
 from os import getenv
@@ -61,7 +62,8 @@ _ALERT_AUTO_UPDATE_AFTER_SECONDS = 3600
 # Настраиваем диспетчер бота
 # ==========================
 
-dp = Dispatcher(view=MessagesView())
+# Генератор сообщений загружает расписание, потому создаётся в main()
+dp = Dispatcher()
 
 
 # Добавление Middleware
@@ -90,7 +92,11 @@ async def user_middleware(
     else:
         raise ValueError("Unknown event type")
 
-    user, _ = await User.get_or_create(id=uid)
+    # Почти все пользователи уже есть в базе, потому сначала простой
+    # запрос, а транзакция get_or_create только для новых пользователей
+    user = await User.get_or_none(id=uid)
+    if user is None:
+        user, _ = await User.get_or_create(id=uid)
     data["user"] = user
     return await handler(event, data)
 
@@ -147,7 +153,7 @@ async def get_status_message(
     message = await view.get_status(user, _BOT_VERSION)
     message += f"\n⚙️ Версия бота: {_BOT_VERSION}\n🛠️ Тестер @micronuri"
 
-    timetag = get_update_timetag(timetag_path)
+    timetag = await asyncio.to_thread(get_update_timetag, timetag_path)
     timedelta = int(datetime.now(UTC).timestamp()) - timetag
     message += f"\n📀 Проверка была {get_str_timedelta(timedelta)} назад"
 
@@ -332,6 +338,7 @@ async def main() -> None:
     logger.info("Init DB connection:")
     await Tortoise().init(db_url=_DB_URL, modules={"models": ["sp.db"]})
     await Tortoise.generate_schemas()
+    dp["view"] = MessagesView()
 
     # Загружаем обработчики.
     for r in routers:
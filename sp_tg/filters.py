@@ -13,6 +13,11 @@ from aiogram.filters import BaseFilter
 from aiogram.types import CallbackQuery, Message
 from loguru import logger
 
+# Статусы участников, которым доступны настройки бота
+_ADMIN_STATUSES = frozenset(
+    (ChatMemberStatus.CREATOR, ChatMemberStatus.ADMINISTRATOR)
+)
+
 
 class IsAdmin(BaseFilter):
     """Проверяет что участник является администратором чата.
@@ -45,10 +50,7 @@ class IsAdmin(BaseFilter):
             return True
 
         member = await chat.get_member(event.from_user.id)
-        if member.status not in (
-            ChatMemberStatus.CREATOR,
-            ChatMemberStatus.ADMINISTRATOR,
-        ):
+        if member.status not in _ADMIN_STATUSES:
             await event.answer(
                 "⚙️ Только администраторы чата могут изменять настройки бота."
             )
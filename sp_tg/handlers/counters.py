@@ -4,6 +4,8 @@
 в расписании.
 """
 
+from functools import lru_cache
+
 from aiogram import Router
 from aiogram.filters import Command
 from aiogram.filters.callback_data import CallbackData
@@ -45,6 +47,18 @@ _TARGETS = (
     ("main", "Общее"),
 )
 
+# Функции подсчёта для каждого типа счётчика
+_COUNTER_FUNCS = {
+    "cl": CurrentCounter.cl,
+    "days": CurrentCounter.days,
+    "lessons": CurrentCounter.lessons,
+    "cabinets": CurrentCounter.cabinets,
+}
+
+# Собранные сообщения счётчиков: (хеш расписания, параметры) -> текст
+_COUNTER_MESSAGES_CACHE_SIZE = 256
+_counter_messages: dict[tuple, str] = {}
+
 
 class CounterCallback(CallbackData, prefix="count"):
     """Используется в клавиатуре просмотра счётчиков расписания.
@@ -78,24 +92,20 @@ class CounterCallback(CallbackData, prefix="count"):
 # =======================
 
 
-async def get_counter_keyboard(
-    user: User,
+@lru_cache(maxsize=512)
+def _get_counter_rows(
     counter: str,
     target: CounterTarget,
-    active_intent: str | None = None,
-) -> InlineKeyboardMarkup:
-    """Возвращает клавиатуру, для просмотра счётчиков расписания.
-
-    Позволяет просматривать счётчики расписания по группам и целям:
-    Более подробно про работу счётчиков можно прочитать в классе
-    CurrentCounter.
-
-    Buttons:
-
-    - home => Вернуться к главному сообщению бота.
-    - count:{counter}:{target} => Переключиться на нужный счётчик.
+    active_intent: str | None,
+    *,
+    has_cl: bool,
+) -> tuple[tuple[InlineKeyboardButton, ...], ...]:
+    """Собирает ряды выбора счётчика и подгруппы.
+
+    Эти ряды зависят только от переданных аргументов, потому
+    собираются один раз для каждого сочетания.
     """
-    inline_keyboard = [
+    inline_keyboard: list[list[InlineKeyboardButton]] = [
         [InlineKeyboardButton(text="◁", callback_data="home")],
         [],
     ]
@@ -132,7 +142,7 @@ async def get_counter_keyboard(
         # Если у пользователя не указан класс пропускаем счётчика
         # cl/lessons т.к. его вывод слишком большой без фильтрации
         # по классам в расписании
-        if counter == "cl" and k == "lessons" and user.cl == "":
+        if counter == "cl" and k == "lessons" and not has_cl:
             continue
 
         inline_keyboard[1].append(
@@ -141,6 +151,33 @@ async def get_counter_keyboard(
             )
         )
 
+    return tuple(tuple(row) for row in inline_keyboard)
+
+
+async def get_counter_keyboard(
+    user: User,
+    counter: str,
+    target: CounterTarget,
+    active_intent: str | None = None,
+) -> InlineKeyboardMarkup:
+    """Возвращает клавиатуру, для просмотра счётчиков расписания.
+
+    Позволяет просматривать счётчики расписания по группам и целям:
+    Более подробно про работу счётчиков можно прочитать в классе
+    CurrentCounter.
+
+    Buttons:
+
+    - home => Вернуться к главному сообщению бота.
+    - count:{counter}:{target} => Переключиться на нужный счётчик.
+    """
+    inline_keyboard = [
+        list(row)
+        for row in _get_counter_rows(
+            counter, target, active_intent, has_cl=user.cl != ""
+        )
+    ]
+
     # Добавляем клавиатуру выбора намерений пользователя
     for i, x in enumerate(await user.intents.all()):
         if i % 3 == 0:
@@ -176,7 +213,31 @@ def get_counter_message(
     В зависимости от выбранного счётчика использует соответствующую
     функцию счётчика.
     Более подробно о работе счётчиков смотрите в классе CurrentCounter.
+
+    Результат зависит только от расписания и параметров счётчика,
+    потому собранные сообщения запоминаются по хешу расписания.
     """
+    # Класс пользователя влияет только на счётчик классов по урокам
+    user_cl = (
+        user.cl if counter == "cl" and target == CounterTarget.LESSONS else None
+    )
+    key = (view.sc.hash, counter, target, intent, user_cl)
+    message = _counter_messages.get(key)
+    if message is None:
+        if len(_counter_messages) >= _COUNTER_MESSAGES_CACHE_SIZE:
+            _counter_messages.clear()
+        message = _get_counter_message(view, user, counter, target, intent)
+        _counter_messages[key] = message
+    return message
+
+
+def _get_counter_message(
+    view: MessagesView,
+    user: User,
+    counter: str,
+    target: CounterTarget | None,
+    intent: Intent | None,
+) -> str:
     # Шапка сообщения
     # Добавляем описание намерения, если оно имеется
     if target is not None:
@@ -191,31 +252,13 @@ def get_counter_message(
 
     cur_counter = CurrentCounter(view.sc, intent)
 
-    # Счётчик по классам
-    if counter == "cl":
-        # Дополнительно передаём намерение, если подгруппа по урокам
-        # Ибо иначе результат работы будет слишком большим для бота
-        if target == CounterTarget.LESSONS:
-            cur_counter.intent = Intent(
-                cl=set(
-                    user.cl,
-                ),
-                days=cur_counter.intent.days,
-                lessons=cur_counter.intent.lessons,
-                cabinets=cur_counter.intent.cabinets,
-            )
-        groups = cur_counter.cl()
-
-    # Счётчик по дням
-    elif counter == "days":
-        groups = cur_counter.days()
-
-    # Счётчики по индексам
-    elif counter == "lessons":
-        groups = cur_counter.lessons()
-    else:
-        groups = cur_counter.cabinets()
+    # Для счётчика классов по урокам дополнительно передаём намерение
+    # Ибо иначе результат работы будет слишком большим для бота
+    if counter == "cl" and target == CounterTarget.LESSONS:
+        cur_counter.intent = intent._replace(cl=frozenset((user.cl,)))
 
+    count = _COUNTER_FUNCS.get(counter, CurrentCounter.cabinets)
+    groups = count(cur_counter)
     message += view.counter(groups=groups, target=target)
     return message
 
@@ -229,12 +272,11 @@ async def counter_handler(
     message: Message, user: User, view: MessagesView
 ) -> None:
     """Переводит в меню просмотра счётчиков расписания."""
-    await message.answer(
-        text=get_counter_message(view, user, "lessons", CounterTarget.MAIN),
-        reply_markup=await get_counter_keyboard(
-            user=user, counter="lessons", target=CounterTarget.MAIN
-        ),
+    text = get_counter_message(view, user, "lessons", CounterTarget.MAIN)
+    markup = await get_counter_keyboard(
+        user=user, counter="lessons", target=CounterTarget.MAIN
     )
+    await message.answer(text=text, reply_markup=markup)
 
 
 @router.callback_query(CounterCallback.filter())
@@ -270,12 +312,11 @@ async def counter_callback(
         intent = None
 
     # Отправляем сообщение пользователю
-    await query.message.edit_text(
-        text=get_counter_message(view, user, counter, target, intent),
-        reply_markup=await get_counter_keyboard(
-            user=user,
-            counter=counter,
-            target=target,
-            active_intent=callback_data.intent,
-        ),
+    text = get_counter_message(view, user, counter, target, intent)
+    markup = await get_counter_keyboard(
+        user=user,
+        counter=counter,
+        target=target,
+        active_intent=callback_data.intent,
     )
+    await query.message.edit_text(text=text, reply_markup=markup)
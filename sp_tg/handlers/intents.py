@@ -79,7 +79,7 @@ INTENTS_LIMIT_MESSAGE = (
 # Обработка намерений ----------------------------------------------------------
 
 
-async def get_intents_keyboard(user: User) -> InlineKeyboardMarkup:
+def get_intents_keyboard(intents: list[UserIntent]) -> InlineKeyboardMarkup:
     """Отправляет клавиатуру редактора намерений.
 
     Используется в главном сообщении редактора.
@@ -87,26 +87,25 @@ async def get_intents_keyboard(user: User) -> InlineKeyboardMarkup:
     Добавить новое намерение, если не превышает лимит.
     Или перейти в режим быстрого удаления.
 
+    Принимает уже загруженный список намерений пользователя, чтобы
+    сообщение и клавиатура обходились одним запросом к базе данных.
+
     Buttons:
         intent:show:{name} => Показать информацию о намерении.
         intents:remove_mode => Перейти в режим быстрого удаления.
         intent:add: => Добавить новое намерение.
         home => Вернуться на главный экран.
     """
-    inline_keyboard: list[list[InlineKeyboardButton]] = [[]]
-    intents = await user.intents.all()
+    buttons = [
+        InlineKeyboardButton(text=x.name, callback_data=f"intent:show:{x.name}")
+        for x in intents
+    ]
+    inline_keyboard: list[list[InlineKeyboardButton]] = [
+        [],
+        *(buttons[i : i + 3] for i in range(0, len(buttons), 3)),
+    ]
 
     if len(intents):
-        for i, x in enumerate(intents):
-            if i % 3 == 0:
-                inline_keyboard.append([])
-
-            inline_keyboard[-1].append(
-                InlineKeyboardButton(
-                    text=x.name, callback_data=f"intent:show:{x.name}"
-                )
-            )
-
         inline_keyboard.append(
             [
                 InlineKeyboardButton(
@@ -211,14 +210,13 @@ def get_intent_info(name: str, i: UserIntent) -> str:
     return info
 
 
-async def get_intents_message(user: User) -> str:
+def get_intents_message(intents: list[UserIntent]) -> str:
     """Отправляет главное сообщение редактора намерений.
 
     Используется чтобы представить список ваших намерений.
     Для чего нужны намерения и что вы можете сделать в редакторе.
     """
     message = f"💼 Ваши намерения.\n\n{INTENTS_INFO_MESSAGE}\n"
-    intents = await user.intents.all()
 
     if len(intents) == 0:
         message += "\n\nУ вас пока нет намерений."
@@ -269,6 +267,7 @@ class IntentCall(CallbackData, prefix="intent"):
         show => Посмотреть полную информацию о намерении.
         reparse => Изменить параметры намерения.
         remove => Удалить намерение.
+        remove_many => Удалить намерение в режиме удаления.
     """
 
     action: str
@@ -281,18 +280,20 @@ class IntentCall(CallbackData, prefix="intent"):
 @router.message(Command("intents"))
 async def manage_intents_handler(message: Message, user: User) -> None:
     """Команда для просмотра списка намерений пользователя."""
+    intents = await user.intents.all()
     await message.answer(
-        text=await get_intents_message(user),
-        reply_markup=await get_intents_keyboard(user),
+        text=get_intents_message(intents),
+        reply_markup=get_intents_keyboard(intents),
     )
 
 
 @router.callback_query(F.data == "intents")
 async def intents_callback(query: CallbackQuery, user: User) -> None:
     """Кнопка для просмотра списка намерений пользователя."""
+    intents = await user.intents.all()
     await query.message.edit_text(
-        text=await get_intents_message(user),
-        reply_markup=await get_intents_keyboard(user),
+        text=get_intents_message(intents),
+        reply_markup=get_intents_keyboard(intents),
     )
 
 
@@ -368,9 +369,10 @@ async def parse_intent_handler(
     await UserIntent.create(user=user, name=name, intent=i.to_str())
     await state.clear()
 
+    intents = await user.intents.all()
     await message.answer(
-        text=await get_intents_message(user),
-        reply_markup=await get_intents_keyboard(user),
+        text=get_intents_message(intents),
+        reply_markup=get_intents_keyboard(intents),
     )
 
 
@@ -398,9 +400,10 @@ async def remove_intent_call(
 ) -> None:
     """Удаляет намерение по его имени."""
     await user.intents.filter(name=callback_data.name).delete()
+    intents = await user.intents.all()
     await query.message.edit_text(
-        text=await get_intents_message(user),
-        reply_markup=await get_intents_keyboard(user),
+        text=get_intents_message(intents),
+        reply_markup=get_intents_keyboard(intents),
     )
 
 
@@ -451,8 +454,7 @@ async def remove_many_call(
 async def remove_all_call(query: CallbackQuery, user: User) -> None:
     """Удаляет все намерения пользователя."""
     await user.intents.all().delete()
-    await user.save()
     await query.message.edit_text(
-        await get_intents_message(user),
-        reply_markup=await get_intents_keyboard(user),
+        get_intents_message([]),
+        reply_markup=get_intents_keyboard([]),
     )
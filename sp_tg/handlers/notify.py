@@ -6,7 +6,7 @@
 - Включить или отключить рассылку расписания в определённый час.
 """
 
-from collections.abc import Iterable
+from functools import lru_cache
 
 from aiogram import F, Router
 from aiogram.filters import Command
@@ -18,7 +18,7 @@ from aiogram.types import (
     Message,
 )
 
-from sp.db import User
+from sp.db import NOTIFY_HOURS, User
 from sp_tg.filters import IsAdmin
 
 router = Router(name=__name__)
@@ -40,8 +40,24 @@ class NotifyCallback(CallbackData, prefix="notify"):
     hour: int
 
 
+# Кнопки для каждого часа рассылки: (включить, отключить)
+# Выбираются по статусу часа, чтобы не собирать их заново
+_HOUR_BUTTONS = {
+    hour: (
+        InlineKeyboardButton(
+            text=str(hour), callback_data=f"notify:add:{hour}"
+        ),
+        InlineKeyboardButton(
+            text=f"✔️{hour}", callback_data=f"notify:remove:{hour}"
+        ),
+    )
+    for hour in NOTIFY_HOURS
+}
+
+
+@lru_cache(maxsize=512)
 def get_notify_keyboard(
-    enabled: bool, hours: Iterable[tuple[int, bool]]
+    enabled: bool, hours: tuple[tuple[int, bool], ...]
 ) -> InlineKeyboardMarkup:
     """Возвращает клавиатуру для настройки уведомлений.
 
@@ -57,6 +73,9 @@ def get_notify_keyboard(
     - notify:reset:0 => Сбросить часы для рассылки расписания.
     - notify:add:{hour} => Включить рассылку для указанного часа.
     - notify:remove:{hour} => Отключить рассылку для указанного часа.
+
+    Клавиатура зависит только от аргументов, потому кешируется.
+    Полученную разметку нельзя изменять.
     """
     inline_keyboard = [[InlineKeyboardButton(text="◁", callback_data="home")]]
 
@@ -76,7 +95,7 @@ def get_notify_keyboard(
         )
         # Если пользователь уже указал какой-то час, добавляем кнопку
         # для быстрого сброса всей рассылки расписания.
-        if hours:
+        if any(status for _, status in hours):
             inline_keyboard[0].append(
                 InlineKeyboardButton(
                     text="❌ Сброс", callback_data="notify:reset:0"
@@ -89,18 +108,7 @@ def get_notify_keyboard(
                 inline_keyboard.append(hours_line)
                 hours_line = []
 
-            if status:
-                hours_line.append(
-                    InlineKeyboardButton(
-                        text=f"✔️{hour}", callback_data=f"notify:remove:{hour}"
-                    )
-                )
-            else:
-                hours_line.append(
-                    InlineKeyboardButton(
-                        text=str(hour), callback_data=f"notify:add:{hour}"
-                    )
-                )
+            hours_line.append(_HOUR_BUTTONS[hour][status])
 
         if hours_line:
             inline_keyboard.append(hours_line)
@@ -108,29 +116,40 @@ def get_notify_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=inline_keyboard)
 
 
-def get_notify_message(enabled: bool, hours: Iterable[tuple[int, bool]]) -> str:
+_NOTIFY_ENABLED_MESSAGE = (
+    "🔔 Уведомления включены."
+    "\nВы получите уведомление, если расписание изменится."
+    "\n\nТакже вы можете настроить отправку расписания."
+    "\nВ указанное время бот отправит расписание вашего класса."
+)
+_NOTIFY_DISABLED_MESSAGE = (
+    "🔕 уведомления отключены.\nНикаких лишних сообщений."
+)
+
+
+@lru_cache(maxsize=512)
+def get_notify_message(
+    enabled: bool, hours: tuple[tuple[int, bool], ...]
+) -> str:
     """Отправляет сообщение с информацией о статусе уведомлений.
 
     Сообщение о статусе уведомлений содержит в себе:
     Включены ли сейчас уведомления.
     Краткая информация об уведомлениях.
     В какие часы рассылается расписание уроков.
-    """
-    if enabled:
-        message = (
-            "🔔 Уведомления включены."
-            "\nВы получите уведомление, если расписание изменится."
-            "\n\nТакже вы можете настроить отправку расписания."
-            "\nВ указанное время бот отправит расписание вашего класса."
-        )
-        active_hours = [hour[0] for hour in hours if hour[1]]
-        if len(active_hours) > 0:
-            message += "\n\nРасписание будет отправлено в: "
-            message += ", ".join(map(str, active_hours))
-    else:
-        message = "🔕 уведомления отключены.\nНикаких лишних сообщений."
 
-    return message
+    Как и клавиатура, сообщение кешируется по своим аргументам.
+    """
+    if not enabled:
+        return _NOTIFY_DISABLED_MESSAGE
+
+    active_hours = [str(hour) for hour, status in hours if status]
+    if not active_hours:
+        return _NOTIFY_ENABLED_MESSAGE
+    return (
+        f"{_NOTIFY_ENABLED_MESSAGE}"
+        f"\n\nРасписание будет отправлено в: {', '.join(active_hours)}"
+    )
 
 
 # Обработка команд
@@ -140,9 +159,10 @@ def get_notify_message(enabled: bool, hours: Iterable[tuple[int, bool]]) -> str:
 @router.message(Command("notify"))
 async def notify_handler(message: Message, user: User) -> None:
     """Переводит в меню настройки системы уведомлений."""
+    hours = tuple(user.get_hours())
     await message.answer(
-        text=get_notify_message(user.notify, user.get_hours()),
-        reply_markup=get_notify_keyboard(user.notify, user.get_hours()),
+        text=get_notify_message(user.notify, hours),
+        reply_markup=get_notify_keyboard(user.notify, hours),
     )
 
 
@@ -153,9 +173,10 @@ async def notify_handler(message: Message, user: User) -> None:
 @router.callback_query(F.data == "notify")
 async def notify_callback(query: CallbackQuery, user: User) -> None:
     """Переходит к разделу настройки системы уведомлений."""
+    hours = tuple(user.get_hours())
     await query.message.edit_text(
-        text=get_notify_message(user.notify, user.get_hours()),
-        reply_markup=get_notify_keyboard(user.notify, user.get_hours()),
+        text=get_notify_message(user.notify, hours),
+        reply_markup=get_notify_keyboard(user.notify, hours),
     )
 
 
@@ -169,13 +190,9 @@ async def notify_mod_callback(
     - Включить или отключить рассылку в определённый час.
     - Сбросить время рассылки расписания.
     """
-    # Включает отправку всех уведомлений
-    if callback_data.action == "on":
-        user.notify = True
-
-    # Отключает отправку всех уведомлений
-    elif callback_data.action == "off":
-        user.notify = False
+    # Включает или отключает отправку всех уведомлений
+    if callback_data.action in ("on", "off"):
+        user.notify = callback_data.action == "on"
 
     # Включает рассылку расписания в определённый час
     elif callback_data.action == "add":
@@ -189,9 +206,10 @@ async def notify_mod_callback(
     elif callback_data.action == "reset":
         user.reset_hours()
 
-    # Сохраняем данные пользователя
-    await user.save()
+    # Сохраняем только настройки уведомлений пользователя
+    await user.save(update_fields=("notify", "hours", "update_tome"))
+    hours = tuple(user.get_hours())
     await query.message.edit_text(
-        text=get_notify_message(user.notify, user.get_hours()),
-        reply_markup=get_notify_keyboard(user.notify, user.get_hours()),
+        text=get_notify_message(user.notify, hours),
+        reply_markup=get_notify_keyboard(user.notify, hours),
     )
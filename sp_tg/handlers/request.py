@@ -15,7 +15,12 @@ from loguru import logger
 from sp.db import User
 from sp.view.messages import MessagesView
 from sp_tg.keyboards import get_main_keyboard, get_week_keyboard
-from sp_tg.messages import get_home_message
+from sp_tg.messages import (
+    EMPTY_REQUEST_MESSAGE,
+    NO_CLASS_MESSAGE,
+    get_home_message,
+    get_unknown_class_message,
+)
 
 router = Router(name=__name__)
 
@@ -28,6 +33,9 @@ async def process_request(
     Преобразует входящий текст в набор намерений или запрос.
     Производит поиск по урокам/кабинетам
     или получает расписание, в зависимости от намерений.
+
+    Ожидает уже приведённый к нижнему регистру текст, поскольку
+    ключи расписания и индексов хранятся в нижнем регистре.
     """
     intent = view.sc.parse_intent(request_text.split())
 
@@ -64,11 +72,11 @@ async def sc_handler(
     Отправляет предупреждение, если у пользователя не указан класс.
     """
     if command.args is not None:
-        answer = await process_request(user, view, command.args)
+        answer = await process_request(user, view, command.args.strip().lower())
         if answer is not None:
             await message.answer(text=answer)
         else:
-            await message.answer(text="👀 Кажется это пустой запрос...")
+            await message.answer(text=EMPTY_REQUEST_MESSAGE)
 
     elif user.cl != "":
         await message.answer(
@@ -76,9 +84,7 @@ async def sc_handler(
             reply_markup=get_week_keyboard(user.cl),
         )
     else:
-        await message.answer(
-            text="⚠️ Для быстрого получения расписания вам нужно указать класс."
-        )
+        await message.answer(text=NO_CLASS_MESSAGE)
 
 
 @router.message()
@@ -103,10 +109,10 @@ async def main_handler(
         if answer is not None:
             await message.answer(text=answer)
         elif message.chat.type == "private":
-            await message.answer(text="👀 Кажется это пустой запрос...")
+            await message.answer(text=EMPTY_REQUEST_MESSAGE)
 
     # Устанавливаем класс пользователя, если он ввёл класс
-    elif text in view.sc.lessons:
+    elif text in view.sc.classes:
         logger.info("Set class {}", text)
         await user.set_cl(text, view.sc)
         relative_day = view.relative_day(user)
@@ -117,6 +123,6 @@ async def main_handler(
 
     # Отправляем список классов, в личные сообщения.
     elif message.chat.type == "private":
-        text = "👀 Такого класса не существует."
-        text += f"\n💡 Доступные классы: {', '.join(view.sc.lessons)}"
-        await message.answer(text=text)
+        await message.answer(
+            text=get_unknown_class_message(view.sc.classes_str)
+        )
@@ -10,6 +10,7 @@ from aiogram.filters.callback_data import CallbackData
 from aiogram.types import CallbackQuery, Message
 
 from sp.db import User
+from sp.enums import ALL_DAYS
 from sp.view.messages import MessagesView
 from sp_tg.keyboards import (
     get_sc_keyboard,
@@ -45,6 +46,11 @@ class SelectDayCallback(CallbackData, prefix="select_day"):
     cl: str
 
 
+def _week_lessons(view: MessagesView, cl: str) -> str:
+    """Собирает расписание уроков класса на всю неделю."""
+    return view.lessons(view.sc.construct_intent(days=ALL_DAYS, cl=cl))
+
+
 # Описание команд
 # ===============
 
@@ -55,11 +61,7 @@ async def week_sc_command(
 ) -> None:
     """Расписание уроков на неделю."""
     await message.answer(
-        text=view.lessons(
-            await user.intent_or(
-                view.sc.construct_intent(days=[0, 1, 2, 3, 4, 5], cl=user.cl)
-            ),
-        ),
+        text=_week_lessons(view, user.cl),
         reply_markup=get_sc_keyboard(user.cl, view.relative_day(user)),
     )
 
@@ -78,11 +80,7 @@ async def sc_callback(
     """Отправляет расписание уроков для класса в указанный день."""
     # Расписание на неделю
     if callback_data.day == "week":
-        text = view.lessons(
-            await user.intent_or(
-                view.sc.construct_intent(days=[0, 1, 2, 3, 4, 5], cl=user.cl)
-            ),
-        )
+        text = _week_lessons(view, callback_data.cl)
         relative_day = view.relative_day(user)
         reply_markup = get_sc_keyboard(callback_data.cl, relative_day)
 
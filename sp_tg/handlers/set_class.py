@@ -18,7 +18,11 @@ from sp.db import User
 from sp.view.messages import MessagesView
 from sp_tg.filters import IsAdmin
 from sp_tg.keyboards import PASS_SET_CL_MARKUP, get_main_keyboard
-from sp_tg.messages import SET_CLASS_MESSAGE, get_home_message
+from sp_tg.messages import (
+    SET_CLASS_MESSAGE,
+    get_home_message,
+    get_unknown_class_message,
+)
 
 router = Router(name=__name__)
 
@@ -85,9 +89,9 @@ async def set_class_command(
             )
         # Если такого класса не существует
         else:
-            text = "👀 Такого класса не существует."
-            text += f"\n💡 Доступные классы: {', '.join(view.sc.lessons)}"
-            await message.answer(text=text)
+            await message.answer(
+                text=get_unknown_class_message(view.sc.classes_str)
+            )
 
     # Сбрасываем пользователя и переводим в состояние выбора класса
     else:
@@ -6,6 +6,8 @@
 Использование системы намерений для уточнения списка изменений.
 """
 
+import asyncio
+
 from aiogram import Router
 from aiogram.filters import Command
 from aiogram.filters.callback_data import CallbackData
@@ -26,6 +28,14 @@ router = Router(name=__name__)
 
 # Максимальный размер сообщения с изменениями в расписании
 _MAX_UPDATE_MESSAGE_LENGTH = 4000
+# Меньше строки "1: \n" изменение урока занять не может
+_MIN_CHANGE_LENGTH = 4
+# Пауза между нажатиями, после которой страница будет отправлена
+_UPDATES_DEBOUNCE = 0.2
+# Ожидающие нажатия для каждого сообщения: (чат, сообщение) -> задача
+_pending_calls: dict[tuple[int, int], asyncio.Task[None]] = {}
+# На сколько страниц сдвигается просмотр при нажатии на кнопку
+_PAGE_STEPS = {"next": 1, "back": -1}
 
 
 class UpdatesCallback(CallbackData, prefix="updates"):
@@ -115,6 +125,19 @@ async def get_updates_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=inline_keyboard)
 
 
+def _min_update_length(update: UpdateData) -> int:
+    """Нижняя оценка длины текста со списком изменений.
+
+    Считает только количество изменённых уроков, не собирая текст.
+    Если даже оценка превышает предел, сообщение можно не собирать.
+    """
+    return _MIN_CHANGE_LENGTH * sum(
+        len(cl_updates) - cl_updates.count(None)
+        for day_updates in update["updates"]
+        for cl_updates in day_updates.values()
+    )
+
+
 def get_updates_message(
     view: MessagesView,
     update: UpdateData | None = None,
@@ -133,19 +156,59 @@ def get_updates_message(
     if intent is not None:
         message += f"⚙️ {get_intent_status(intent)}\n"
 
-    if update is not None:
+    if update is None:
+        message += "✨ Нет новых обновлений."
+    elif _min_update_length(update) > _MAX_UPDATE_MESSAGE_LENGTH:
+        message += "\n📚 Слишком много изменений."
+    else:
         update_text = view.update(update, hide_cl=cl)
 
         if len(update_text) > _MAX_UPDATE_MESSAGE_LENGTH:
             message += "\n📚 Слишком много изменений."
         else:
             message += update_text
-    else:
-        message += "✨ Нет новых обновлений."
 
     return message
 
 
+def _wrap_page(page: int, total: int, step: int) -> int:
+    """Сдвигает номер страницы по кругу в пределах списка изменений.
+
+    Номер страницы из кнопки сначала приводится к границам списка.
+    Для пустого списка всегда возвращает первую страницу.
+    """
+    if total <= 0:
+        return 0
+    return (max(min(page, total - 1), 0) + step) % total
+
+
+async def _debounce(key: tuple[int, int]) -> bool:
+    """Выжидает паузу между нажатиями на клавиатуру сообщения.
+
+    Если за время ожидания пришло новое нажатие, то текущее отменяется.
+    Так при быстром листании отправляется только последняя страница.
+    Возвращает False, если нажатие было заменено более новым.
+    """
+    old_task = _pending_calls.pop(key, None)
+    if old_task is not None:
+        old_task.cancel()
+
+    task = asyncio.create_task(asyncio.sleep(_UPDATES_DEBOUNCE))
+    _pending_calls[key] = task
+    try:
+        await task
+    except asyncio.CancelledError:
+        # Отменили сам обработчик, а не ожидание нажатия
+        current = asyncio.current_task()
+        if current is not None and current.cancelling():
+            raise
+        return False
+    finally:
+        if _pending_calls.get(key) is task:
+            del _pending_calls[key]
+    return True
+
+
 # Описание команд
 # ===============
 
@@ -162,12 +225,9 @@ async def updates_handler(
     updates = view.sc.updates
     if updates is None:
         raise ValueError("Schedule updates is None")
-    await message.answer(
-        text=get_updates_message(view, updates[-1] if len(updates) else None),
-        reply_markup=await get_updates_keyboard(
-            max(len(updates) - 1, 0), updates, user
-        ),
-    )
+    text = get_updates_message(view, updates[-1] if len(updates) else None)
+    markup = await get_updates_keyboard(max(len(updates) - 1, 0), updates, user)
+    await message.answer(text=text, reply_markup=markup)
 
 
 # Callback обработчики
@@ -186,7 +246,12 @@ async def updates_call(
     - Переключение просмотра с общего на для класса.
     - Перемещает в конец списка изменений.
     - Позволяет перемешаться по страницам изменений вперёд и назад.
+
+    Быстрые повторные нажатия склеиваются, обрабатывается последнее.
     """
+    if not await _debounce((query.message.chat.id, query.message.message_id)):
+        return
+
     # Смена режима просмотра: только для класса/всего расписания
     if callback_data.action == "switch":
         cl = user.cl if callback_data.cl == "None" else None
@@ -206,14 +271,7 @@ async def updates_call(
     # Заменяем намерения на просмотр для класса по умолчанию
     if cl is not None and user.cl is not None:
         if intent is not None:
-            intent = Intent(
-                cl=set(
-                    cl,
-                ),
-                days=intent.days,
-                lessons=intent.lessons,
-                cabinets=intent.cabinets,
-            )
+            intent = intent._replace(cl=frozenset((cl,)))
         else:
             intent = view.sc.construct_intent(cl=cl)
 
@@ -223,30 +281,17 @@ async def updates_call(
     # Если намерение указан, фильтруем результаты поиска
     else:
         updates = view.sc.get_updates(intent)
-    i = max(min(int(callback_data.page), len(updates) - 1), 0)
-
-    # Если в результате есть записи об изменениях
-    if len(updates):
-        # Переключаемся на последнюю запись
-        if callback_data.action in ("last", "switch"):
-            i = len(updates) - 1
-
-        # Перемещаемся на следующая запись
-        elif callback_data.action == "next":
-            i = (i + 1) % len(updates)
-
-        # Перемещаемся на предыдущая запись
-        elif callback_data.action == "back":
-            i = (i - 1) % len(updates)
-
-        update = updates[i]
+    # Переключаемся на последнюю запись или сдвигаем текущую страницу
+    total = len(updates)
+    if callback_data.action in ("last", "switch"):
+        i = max(total - 1, 0)
     else:
-        update = None
+        i = _wrap_page(
+            callback_data.page, total, _PAGE_STEPS.get(callback_data.action, 0)
+        )
+    update = updates[i] if total else None
 
     # Отправляем результат пользователю
-    await query.message.edit_text(
-        text=get_updates_message(view, update, cl, intent),
-        reply_markup=await get_updates_keyboard(
-            i, updates, user, callback_data.intent
-        ),
-    )
+    text = get_updates_message(view, update, cl, intent)
+    markup = await get_updates_keyboard(i, updates, user, callback_data.intent)
+    await query.message.edit_text(text=text, reply_markup=markup)
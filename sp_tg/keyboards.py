@@ -4,6 +4,8 @@
 Они могут быть использованы всеми обработчиками бота.
 """
 
+from functools import lru_cache
+
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 from sp.enums import SHORT_DAY_NAMES
@@ -26,8 +28,11 @@ PASS_SET_CL_MARKUP = InlineKeyboardMarkup(
 
 
 # Для расписания уроков --------------------------------------------------------
+# Клавиатуры зависят только от аргументов, потому кешируются.
+# Полученную разметку нельзя изменять, она общая для всех вызовов.
 
 
+@lru_cache(maxsize=256)
 def get_week_keyboard(cl: str) -> InlineKeyboardMarkup:
     """Возвращает клавиатуру, для получение расписания на неделю.
 
@@ -56,6 +61,7 @@ def get_week_keyboard(cl: str) -> InlineKeyboardMarkup:
     )
 
 
+@lru_cache(maxsize=256)
 def get_sc_keyboard(cl: str, relative_day: str) -> InlineKeyboardMarkup:
     """Возвращает клавиатуру, для получения расписания на сегодня.
 
@@ -84,6 +90,7 @@ def get_sc_keyboard(cl: str, relative_day: str) -> InlineKeyboardMarkup:
     )
 
 
+@lru_cache(maxsize=256)
 def get_select_day_keyboard(cl: str, relative_day: str) -> InlineKeyboardMarkup:
     """Возвращает клавиатуру выбора дня недели в расписании.
 
@@ -119,6 +126,7 @@ def get_select_day_keyboard(cl: str, relative_day: str) -> InlineKeyboardMarkup:
 # Основные клавиатуры ----------------------------------------------------------
 
 
+@lru_cache(maxsize=256)
 def get_other_keyboard(
     cl: str | None = None, home_button: bool | None = True
 ) -> InlineKeyboardMarkup:
@@ -165,6 +173,7 @@ def get_other_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@lru_cache(maxsize=256)
 def get_main_keyboard(
     cl: str, relative_day: str | None = None
 ) -> InlineKeyboardMarkup:
@@ -181,6 +190,9 @@ def get_main_keyboard(
     - other => Вызов дополнительной клавиатуры.
     - notify => Меню настройки уведомлений пользователя.
     - sc:{cl}:today => Получаем расписания на сегодня/завтра для класса.
+
+    Клавиатура зависит только от аргументов, потому кешируется.
+    Полученную разметку нельзя изменять.
     """
     if cl == "":
         return get_other_keyboard(cl, home_button=False)
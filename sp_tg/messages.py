@@ -37,6 +37,21 @@ HOME_MESSAGE = (
     "\n\n🌟 Хотите научиться писать запросы? /tutorial"
 )
 
+# Главное сообщение для пользователей без класса собирается один раз
+_NO_CLASS_HOME_MESSAGE = f"🌟 Вы не привязаны к классу.\n\n{HOME_MESSAGE}"
+
+# Частые короткие ответы обработчиков запросов
+EMPTY_REQUEST_MESSAGE = "👀 Кажется это пустой запрос..."
+NO_CLASS_MESSAGE = (
+    "⚠️ Для быстрого получения расписания вам нужно указать класс."
+)
+UNKNOWN_CLASS_MESSAGE = "👀 Такого класса не существует."
+
+
+def get_unknown_class_message(classes: str) -> str:
+    """Сообщает о неизвестном классе и перечисляет доступные классы."""
+    return f"{UNKNOWN_CLASS_MESSAGE}\n💡 Доступные классы: {classes}"
+
 
 def get_intent_status(i: Intent) -> str:
     """Отображает краткую информацию о содержимом намерения.
@@ -67,8 +82,5 @@ def get_home_message(cl: str) -> str:
     Если вы не привязаны к классу, справка немного отличается.
     """
     if cl:
-        cl_header = f"💎 Ваш класс {cl}"
-    else:
-        cl_header = "🌟 Вы не привязаны к классу."
-
-    return f"{cl_header}\n\n{HOME_MESSAGE}"
+        return f"💎 Ваш класс {cl}\n\n{HOME_MESSAGE}"
+    return _NO_CLASS_HOME_MESSAGE
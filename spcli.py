@@ -14,15 +14,18 @@ Version: v2.0.1 (sp v6.2)
 
 from datetime import datetime
 from time import time
-from typing import NamedTuple
+from typing import TYPE_CHECKING, NamedTuple
 
 import click
 
-from sp.counter import CounterTarget, CurrentCounter
-from sp.db import User
 from sp.intents import Intent
-from sp.platform import Platform
-from sp.view.messages import get_str_timedelta
+
+# Платформа, хранилище и генератор сообщений тянут за собой расписание
+# и базу данных, потому импортируются только в использующих их командах
+if TYPE_CHECKING:
+    from sp.platform import Platform
+
+    from sp.db import User
 
 # Определение группы
 # ==================
@@ -31,12 +34,20 @@ from sp.view.messages import get_str_timedelta
 class AppContext(NamedTuple):
     """Контекст приложения."""
 
-    platform: Platform
-    user: User
+    platform: "Platform"
+    user: "User"
 
 
 pass_app = click.make_pass_decorator(AppContext)
 
+# Счётчики расписания: имя метода CurrentCounter -> заголовок
+_COUNTERS = {
+    "cl": "по классам",
+    "days": "по дням",
+    "lessons": "по урокам",
+    "cabinets": "по кабинетам",
+}
+
 
 @click.option(
     "--uid",
@@ -56,6 +67,10 @@ async def cli(ctx: click.Context, uid: str, pid: int) -> None:
     Позволяет напрямую взаимодействовать с генератором сообщений
     и хранилищем пользователя.
     """
+    from sp.platform import Platform  # noqa: PLC0415
+
+    from sp.view.messages import MessagesView  # noqa: PLC0415
+
     platform = Platform(pid, "Console", VersionInfo("v2.1", 22, 6))
     platform.view = MessagesView()
     user = platform.get_user(uid)
@@ -104,8 +119,13 @@ def sc(app: AppContext, intent: Intent | None) -> None:
 @pass_app
 def users(app: AppContext) -> None:
     """Список всех пользователей платформы."""
-    for k, v in app.platform.users.get_users().items():
-        click.echo(f"-- {k} / {v.cl} - {v.set_class}")
+    users = app.platform.users.get_users()
+    if users:
+        click.echo(
+            "\n".join(
+                f"-- {k} / {v.cl} - {v.set_class}" for k, v in users.items()
+            )
+        )
 
 
 @cli.command()
@@ -124,8 +144,10 @@ def updates(
         offset = int(offset.timestamp())
     if intent is None:
         intent = Intent()
-    for u in app.platform.view.sc.get_updates(intent, offset):
-        click.echo(app.platform.view.update(u))
+    view = app.platform.view
+    updates = view.sc.get_updates(intent, offset)
+    if updates:
+        click.echo("\n".join([view.update(u) for u in updates]))
 
 
 @cli.command()
@@ -137,15 +159,14 @@ def search(
     app: AppContext, target: str, intent: Intent, cabinets: bool
 ) -> None:
     """Глобальный поиск в расписании."""
-    res = app.platform.view.sc.search(target, intent, cabinets)
-    click.echo(send_search_res(intent, res))
+    click.echo(app.platform.view.search(target, intent, cabinets))
 
 
 @cli.command()
 @click.option("--intent", "-i", callback=_get_intent, required=False)
 @click.argument(
     "counter",
-    type=click.Choice(("cl", "days", "lessons", "cabinets")),
+    type=click.Choice(tuple(_COUNTERS)),
     default="lessons",
 )
 @click.argument(
@@ -158,25 +179,12 @@ def counter(
     app: AppContext, intent: Intent | None, counter: str, target: str
 ) -> None:
     """Подсчитывает элементы расписания."""
-    cnt = CurrentCounter(app.platform.view.sc, intent or Intent())
-    header = "✨ Счётчик"
+    from sp.counter import CounterTarget, CurrentCounter  # noqa: PLC0415
 
-    if counter == "cl":
-        header += " по классам:"
-        res = cnt.cl()
-    elif counter == "days":
-        header += " по дням:"
-        res = cnt.days()
-    elif counter == "lessons":
-        header += " по урокам:"
-        res = cnt.index()
-
-    elif counter == "cabinets":
-        header += " по кабинетам:"
-        res = cnt.index(cabinets_mode=True)
-
-    click.echo(header)
-    click.echo(app.platform.counter(res, CounterTarget(target)))
+    cnt = CurrentCounter(app.platform.view.sc, intent or Intent())
+    click.echo(f"✨ Счётчик {_COUNTERS[counter]}:")
+    groups = getattr(cnt, counter)()
+    click.echo(app.platform.counter(groups, CounterTarget(target)))
 
 
 # Пользователи расписания
@@ -192,6 +200,8 @@ def user() -> None:
 @pass_app
 def get(app: AppContext) -> None:
     """Основная информация о пользователе."""
+    from sp.view.messages import get_str_timedelta  # noqa: PLC0415
+
     create_delta = get_str_timedelta(int(time()) - app.user.data.create_time)
     if app.user.data.last_parse != 0:
         parse_delta = get_str_timedelta(int(time()) - app.user.data.last_parse)
@@ -220,17 +230,16 @@ def count(app: AppContext) -> None:
         active_pr = 0
         notify_pr = 0
 
-    click.echo(f"Всего: {c_users.total}")
-    click.echo(f"  | Активных: {c_users.active} ({active_pr}%)")
-    click.echo(f"  | С оповещениями: {c_users.notify} ({notify_pr}%)")
-
-    click.echo(f"по классам ({len(c_users.cl)}):")
-    for k, v in c_users.cl.items():
-        click.echo(f"  | {k}: {v}")
-
-    click.echo(f"по оповещениям ({len(c_users.hour)}):")
-    for k, v in c_users.hour.items():
-        click.echo(f"  | {k}: {v}")
+    lines = [
+        f"Всего: {c_users.total}",
+        f"  | Активных: {c_users.active} ({active_pr}%)",
+        f"  | С оповещениями: {c_users.notify} ({notify_pr}%)",
+        f"по классам ({len(c_users.cl)}):",
+    ]
+    lines.extend(f"  | {k}: {v}" for k, v in c_users.cl.items())
+    lines.append(f"по оповещениям ({len(c_users.hour)}):")
+    lines.extend(f"  | {k}: {v}" for k, v in c_users.hour.items())
+    click.echo("\n".join(lines))
 
 
 @user.command()